@@ -3,7 +3,12 @@ from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False)
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -14,3 +19,21 @@ class Base(DeclarativeBase):
 async def get_db():
     async with async_session() as session:
         yield session
+
+
+def configure_engine(pool_size: int, max_overflow: int) -> None:
+    """Replace the module engine, e.g. in a Celery worker process after fork.
+
+    Connections of the previous engine are dropped without being closed, since
+    they may belong to a parent process or another event loop.
+    """
+    global engine
+    engine.sync_engine.dispose(close=False)
+    engine = create_async_engine(
+        settings.database_url,
+        echo=False,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+    )
+    async_session.configure(bind=engine)
@@ -1,17 +1,37 @@
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import Base, engine
-from app.routers import meetings, reports, tasks, transcripts
+from app.config import settings
+from app.database import engine
+from app.routers import meetings, reports, search, tasks, transcripts
+from app.services import progress, response_cache
+from app.services.llm import cache as llm_cache
+from app.services.llm.factory import close_llm_providers
+from app.services.pagination import NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # The schema is managed by Alembic (`alembic upgrade head`).
+    if settings.live_preload:
+        from app.services.live_transcription import load_live_model
+
+        try:
+            # Load now rather than on the first live utterance.
+            await run_in_threadpool(load_live_model)
+        except Exception:
+            logger.exception("Live model preload failed")
     yield
+    await response_cache.close()
+    await progress.close()
+    await llm_cache.close()
+    await close_llm_providers()
     await engine.dispose()
 
 
@@ -28,14 +48,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 app.include_router(meetings.router)
 app.include_router(transcripts.router)
 app.include_router(tasks.router)
 app.include_router(reports.router)
+app.include_router(search.router)
 
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok", "service": "Meeting Assistant"}
+
+
+@app.get("/api/health/cache")
+async def cache_stats():
+    return {"enabled": settings.response_cache_enabled, "counters": response_cache.stats()}
+
+
+@app.get("/api/health/llm-cache")
+async def llm_cache_stats():
+    return {"enabled": settings.llm_cache_enabled, **await llm_cache.stats()}
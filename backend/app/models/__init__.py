@@ -4,6 +4,7 @@ from app.models.transcript import TranscriptSegment
 from app.models.summary import Summary
 from app.models.task import Task
 from app.models.report import ProgressReport
+from app.models.analysis_run import AnalysisRun
 
 __all__ = [
     "Meeting",
@@ -12,4 +13,5 @@ __all__ = [
     "Summary",
     "Task",
     "ProgressReport",
+    "AnalysisRun",
 ]
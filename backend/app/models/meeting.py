@@ -1,7 +1,19 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, Integer, String, Text, func
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Enum,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    false,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -14,8 +26,20 @@ class MeetingStatus(str, enum.Enum):
     FAILED = "failed"
 
 
+class AsrPolicy(str, enum.Enum):
+    ACCURATE = "accurate"  # full model only
+    DRAFT = "draft"  # draft model only
+    TIERED = "tiered"  # draft first, then refined with the full model
+
+
 class Meeting(Base):
     __tablename__ = "meetings"
+    __table_args__ = (
+        # Keyset pagination of GET /api/meetings, optionally filtered by status
+        Index("ix_meetings_created_at_id", "created_at", "id"),
+        Index("ix_meetings_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_meetings_date", "date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(255))
@@ -23,9 +47,26 @@ class Meeting(Base):
     date: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     duration_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
     audio_file_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    audio_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    audio_size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     status: Mapped[MeetingStatus] = mapped_column(
         Enum(MeetingStatus), default=MeetingStatus.UPLOADING
     )
+    # ASR settings the transcript was produced with (for upload deduplication)
+    asr_model: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    asr_language: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    # None follows settings.asr_policy
+    asr_policy: Mapped[AsrPolicy | None] = mapped_column(Enum(AsrPolicy), nullable=True)
+    # True while the transcript comes from the draft model
+    transcript_draft: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
+    # Length of the decoded recording and the silence the VAD pre-pass kept
+    # out of ASR and diarization
+    audio_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    silence_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Wall time of the transcribe, align and diarize stages, summed
+    asr_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Last completed pipeline stage, see app.services.checkpoints.STAGES
+    processing_stage: Mapped[str | None] = mapped_column(String(30), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now()
@@ -19,10 +19,12 @@ class ProgressReport(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     meeting_id: Mapped[int | None] = mapped_column(
-        ForeignKey("meetings.id", ondelete="SET NULL"), nullable=True
+        ForeignKey("meetings.id", ondelete="SET NULL"), nullable=True, index=True
     )
     report_type: Mapped[ReportType] = mapped_column(Enum(ReportType))
     content: Mapped[dict] = mapped_column(JSONB, default=dict)
-    generated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    generated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), index=True
+    )
 
     meeting = relationship("Meeting", back_populates="reports")
@@ -1,7 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text, func
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, Integer, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -9,6 +9,7 @@ from app.database import Base
 
 class Summary(Base):
     __tablename__ = "summaries"
+    __table_args__ = (Index("ix_summaries_search", "search_vector", postgresql_using="gin"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     meeting_id: Mapped[int] = mapped_column(
@@ -18,5 +19,8 @@ class Summary(Base):
     key_points: Mapped[dict] = mapped_column(JSONB, default=list)
     decisions: Mapped[dict] = mapped_column(JSONB, default=list)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('turkish', full_summary)", persisted=True), deferred=True
+    )
 
     meeting = relationship("Meeting", back_populates="summary")
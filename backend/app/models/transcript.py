@@ -1,4 +1,5 @@
-from sqlalchemy import Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Computed, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -6,6 +7,12 @@ from app.database import Base
 
 class TranscriptSegment(Base):
     __tablename__ = "transcript_segments"
+    __table_args__ = (
+        # Ordered transcript reads and cascade deletes by meeting
+        Index("ix_transcript_segments_meeting_order", "meeting_id", "segment_order"),
+        Index("ix_transcript_segments_participant_id", "participant_id"),
+        Index("ix_transcript_segments_search", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.id", ondelete="CASCADE"))
@@ -18,6 +25,10 @@ class TranscriptSegment(Base):
     text: Mapped[str] = mapped_column(Text)
     confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
     segment_order: Mapped[int] = mapped_column(Integer)
+    # Maintained by Postgres, so bulk INSERT and COPY index new segments too
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('turkish', text)", persisted=True), deferred=True
+    )
 
     meeting = relationship("Meeting", back_populates="transcript_segments")
     participant = relationship("Participant")
@@ -1,8 +1,11 @@
 import os
+from datetime import datetime
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -10,6 +13,9 @@ from app.config import settings
 from app.database import get_db
 from app.models.meeting import Meeting, MeetingStatus
 from app.models.participant import Participant
+from app.models.summary import Summary
+from app.models.task import Task
+from app.models.transcript import TranscriptSegment
 from app.schemas.meeting import (
     MeetingCreate,
     MeetingDetail,
@@ -17,13 +23,21 @@ from app.schemas.meeting import (
     ParticipantOut,
     ParticipantUpdate,
 )
+from app.schemas.upload import UploadSessionCreate, UploadSessionOut
+from app.services import audio_cache, progress, response_cache
+from app.services.checkpoints import StageCheckpoints
+from app.services.deduplication import clone_meeting_results, find_processed_duplicate
+from app.services.live_transcription import handle_live_stream
+from app.services.pagination import decode_cursor, set_next_cursor
+from app.services.resumable_uploads import UploadSession, expire_stale_sessions
+from app.services.uploads import is_allowed_audio, receive_audio_upload
 
 router = APIRouter(prefix="/api/meetings", tags=["meetings"])
 
 
 @router.post("", response_model=MeetingOut, status_code=201)
 async def create_meeting(data: MeetingCreate, db: AsyncSession = Depends(get_db)):
-    meeting = Meeting(title=data.title, description=data.description)
+    meeting = Meeting(title=data.title, description=data.description, asr_policy=data.asr_policy)
     if data.date:
         meeting.date = data.date
     db.add(meeting)
@@ -33,22 +47,43 @@ async def create_meeting(data: MeetingCreate, db: AsyncSession = Depends(get_db)
 
 
 @router.get("", response_model=list[MeetingOut])
-async def list_meetings(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Meeting).order_by(Meeting.created_at.desc()))
-    return result.scalars().all()
+async def list_meetings(
+    response: Response,
+    status: MeetingStatus | None = Query(None),
+    date_from: datetime | None = Query(None),
+    date_to: datetime | None = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Newest first; the next page's cursor is returned in the X-Next-Cursor header."""
+    query = select(Meeting).order_by(Meeting.created_at.desc(), Meeting.id.desc())
+    if status:
+        query = query.where(Meeting.status == status)
+    if date_from:
+        query = query.where(Meeting.date >= date_from)
+    if date_to:
+        query = query.where(Meeting.date < date_to)
+    if cursor:
+        query = query.where(tuple_(Meeting.created_at, Meeting.id) < decode_cursor(cursor))
+    result = await db.execute(query.limit(limit + 1))
+    return set_next_cursor(response, list(result.scalars()), limit)
 
 
 @router.get("/{meeting_id}", response_model=MeetingDetail)
-async def get_meeting(meeting_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Meeting)
-        .options(selectinload(Meeting.participants))
-        .where(Meeting.id == meeting_id)
-    )
-    meeting = result.scalar_one_or_none()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
-    return meeting
+async def get_meeting(meeting_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    async def build():
+        result = await db.execute(
+            select(Meeting)
+            .options(selectinload(Meeting.participants))
+            .where(Meeting.id == meeting_id)
+        )
+        meeting = result.scalar_one_or_none()
+        if not meeting:
+            raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
+        return MeetingDetail.model_validate(meeting)
+
+    return await response_cache.cached_response(request, meeting_id, "detail", build)
 
 
 @router.delete("/{meeting_id}", status_code=204)
@@ -57,14 +92,42 @@ async def delete_meeting(meeting_id: int, db: AsyncSession = Depends(get_db)):
     meeting = result.scalar_one_or_none()
     if not meeting:
         raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
+    audio_file_path, audio_sha256 = meeting.audio_file_path, meeting.audio_sha256
     await db.delete(meeting)
     await db.commit()
+    await response_cache.invalidate_meeting(meeting_id)
+
+    await run_in_threadpool(StageCheckpoints(meeting_id).clear)
+    if not audio_sha256 and audio_file_path and Path(audio_file_path).exists():
+        audio_sha256 = await run_in_threadpool(audio_cache.file_sha256, audio_file_path)
+    # Meetings deduplicated against this one may still need the decoded audio.
+    if audio_sha256 and not await db.scalar(
+        select(Meeting.id).where(Meeting.audio_sha256 == audio_sha256).limit(1)
+    ):
+        audio_cache.discard(audio_sha256)
 
 
-@router.post("/{meeting_id}/upload", response_model=MeetingOut)
+@router.post(
+    "/{meeting_id}/upload",
+    response_model=MeetingOut,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                        "required": ["file"],
+                    }
+                }
+            },
+        }
+    },
+)
 async def upload_audio(
     meeting_id: int,
-    file: UploadFile,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
@@ -72,23 +135,204 @@ async def upload_audio(
     if not meeting:
         raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
 
-    upload_dir = Path(settings.upload_dir)
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    # Streamed straight to disk; the body is never held in memory.
+    upload = await receive_audio_upload(request, stem=f"meeting_{meeting_id}")
+    return await _start_processing(db, meeting, upload.path, upload.sha256, upload.size)
+
+
+@router.websocket("/{meeting_id}/live")
+async def live_transcription(
+    websocket: WebSocket,
+    meeting_id: int,
+    audio_format: str = Query("pcm", alias="format", pattern="^(pcm|opus)$"),
+):
+    """Ingest audio while the meeting is happening and transcribe it incrementally.
+
+    ``format=pcm`` expects 16 kHz mono s16le frames; ``format=opus`` accepts a
+    WebM/Ogg Opus stream such as MediaRecorder output.
+    """
+    await websocket.accept()
+    await handle_live_stream(websocket, meeting_id, audio_format)
+
+
+@router.post("/{meeting_id}/uploads", response_model=UploadSessionOut, status_code=201)
+async def create_upload_session(
+    meeting_id: int,
+    data: UploadSessionCreate,
+    db: AsyncSession = Depends(get_db),
+):
+    """Start a resumable upload; chunks are then PUT at multiples of ``chunk_size``."""
+    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+    if not result.scalar_one_or_none():
+        raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
+    if not is_allowed_audio(data.filename, "application/octet-stream"):
+        raise HTTPException(status_code=415, detail="Desteklenmeyen dosya türü")
+    if data.size > settings.max_upload_mb * 1024 * 1024:
+        raise HTTPException(status_code=413, detail="Dosya boyutu sınırı aşıldı")
+
+    await run_in_threadpool(expire_stale_sessions)
+    session = await run_in_threadpool(
+        UploadSession.create,
+        meeting_id,
+        data.filename,
+        data.size,
+        data.chunk_size or settings.upload_chunk_mb * 1024 * 1024,
+    )
+    return _session_out(session)
+
+
+@router.get("/{meeting_id}/uploads/{upload_id}", response_model=UploadSessionOut)
+async def get_upload_session(meeting_id: int, upload_id: str):
+    """Report received chunks so an interrupted client knows where to continue."""
+    session = await _get_upload_session(meeting_id, upload_id)
+    return await run_in_threadpool(_session_out, session)
+
+
+@router.put("/{meeting_id}/uploads/{upload_id}", response_model=UploadSessionOut)
+async def put_upload_chunk(
+    meeting_id: int,
+    upload_id: str,
+    request: Request,
+    offset: int = Query(ge=0),
+):
+    """Write one chunk (raw request body) at ``offset``; chunks may arrive in parallel."""
+    session = await _get_upload_session(meeting_id, upload_id)
+    await session.write_chunk(offset, request.stream())
+    return await run_in_threadpool(_session_out, session)
 
-    ext = os.path.splitext(file.filename or "audio.wav")[1]
-    file_path = upload_dir / f"meeting_{meeting_id}{ext}"
 
-    content = await file.read()
-    file_path.write_bytes(content)
+@router.post("/{meeting_id}/uploads/{upload_id}/complete", response_model=MeetingOut)
+async def complete_upload_session(
+    meeting_id: int,
+    upload_id: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """Assemble the upload and start processing; a repeated request gets the same answer."""
+    session = await _get_upload_session(meeting_id, upload_id)
+    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+    meeting = result.scalar_one_or_none()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
 
+    completed = await run_in_threadpool(session.completed_sha256)
+    if completed is not None:
+        if meeting.audio_sha256 != completed:
+            raise HTTPException(status_code=409, detail="Toplantıya başka bir kayıt yüklenmiş")
+        return meeting
+
+    received = await run_in_threadpool(session.received_chunks)
+    if len(received) != session.total_chunks:
+        raise HTTPException(status_code=409, detail="Eksik parçalar var")
+    if not await run_in_threadpool(session.claim_completion):
+        raise HTTPException(
+            status_code=409, detail="Yükleme zaten tamamlanıyor ya da parça yazımı sürüyor"
+        )
+
+    ext = os.path.splitext(session.meta.filename)[1].lower()
+    file_path = Path(settings.upload_dir) / f"meeting_{meeting_id}{ext}"
+    try:
+        sha256 = await run_in_threadpool(session.assemble, file_path)
+    except BaseException:
+        await run_in_threadpool(session.release_completion)
+        raise
+    meeting = await _start_processing(db, meeting, file_path, sha256, session.meta.size)
+    await run_in_threadpool(session.mark_completed, sha256)
+    return meeting
+
+
+@router.delete("/{meeting_id}/uploads/{upload_id}", status_code=204)
+async def abort_upload_session(meeting_id: int, upload_id: str):
+    session = await _get_upload_session(meeting_id, upload_id)
+    await run_in_threadpool(session.discard)
+
+
+async def _get_upload_session(meeting_id: int, upload_id: str) -> UploadSession:
+    session = await run_in_threadpool(UploadSession.load, upload_id)
+    if not session or session.meta.meeting_id != meeting_id:
+        raise HTTPException(status_code=404, detail="Yükleme oturumu bulunamadı")
+    return session
+
+
+def _session_out(session: UploadSession) -> UploadSessionOut:
+    return UploadSessionOut(
+        upload_id=session.upload_id,
+        meeting_id=session.meta.meeting_id,
+        filename=session.meta.filename,
+        size=session.meta.size,
+        chunk_size=session.meta.chunk_size,
+        total_chunks=session.total_chunks,
+        offset=session.contiguous_offset(),
+        received_chunks=session.received_chunks(),
+    )
+
+
+async def _start_processing(
+    db: AsyncSession, meeting: Meeting, file_path: Path, sha256: str, size: int
+) -> Meeting:
+    """Attach a fully received recording to the meeting and enqueue the pipeline.
+
+    A recording that was already processed with the same ASR settings is not
+    processed again; the earlier results are copied instead.
+    """
     meeting.audio_file_path = str(file_path)
+    meeting.audio_sha256 = sha256
+    meeting.audio_size_bytes = size
     meeting.status = MeetingStatus.PROCESSING
+    meeting.processing_stage = None
+    # A new recording invalidates any stage output and results of the previous one.
+    await run_in_threadpool(StageCheckpoints(meeting.id).clear)
+    await _clear_results(db, meeting.id)
+
+    duplicate = await find_processed_duplicate(db, meeting)
+    if duplicate:
+        await clone_meeting_results(db, duplicate, meeting)
+        await db.commit()
+        await response_cache.invalidate_meeting(meeting.id)
+        await db.refresh(meeting)
+        return meeting
+
     await db.commit()
+    await response_cache.invalidate_meeting(meeting.id)
+    await progress.clear(meeting.id)
     await db.refresh(meeting)
 
     # Trigger background processing
     from app.workers.tasks import process_meeting_audio
 
+    process_meeting_audio.delay(meeting.id)
+
+    return meeting
+
+
+async def _clear_results(db: AsyncSession, meeting_id: int) -> None:
+    """Remove output of an earlier recording of this meeting."""
+    for model in (Task, Summary, TranscriptSegment, Participant):
+        await db.execute(delete(model).where(model.meeting_id == meeting_id))
+
+
+@router.post("/{meeting_id}/resume", response_model=MeetingOut)
+async def resume_processing(meeting_id: int, db: AsyncSession = Depends(get_db)):
+    """Re-enqueue a failed meeting; the pipeline continues after its last completed stage."""
+    # The row lock makes the status check and flip atomic, so two concurrent
+    # resumes cannot both enqueue a pipeline.
+    meeting = await db.get(Meeting, meeting_id, with_for_update=True)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
+    if not meeting.audio_file_path:
+        raise HTTPException(status_code=409, detail="Toplantıya ait ses kaydı yok")
+    if meeting.status != MeetingStatus.FAILED:
+        raise HTTPException(
+            status_code=409, detail="Yalnızca başarısız olan toplantılar sürdürülebilir"
+        )
+
+    meeting.status = MeetingStatus.PROCESSING
+    await db.commit()
+    await response_cache.invalidate_meeting(meeting_id)
+    await progress.clear(meeting_id)
+    await db.refresh(meeting)
+
+    from app.workers.tasks import process_meeting_audio
+
     process_meeting_audio.delay(meeting_id)
 
     return meeting
@@ -100,7 +344,32 @@ async def get_meeting_status(meeting_id: int, db: AsyncSession = Depends(get_db)
     meeting = result.scalar_one_or_none()
     if not meeting:
         raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
-    return {"status": meeting.status}
+    stage = meeting.processing_stage or await run_in_threadpool(
+        StageCheckpoints(meeting_id).last_completed
+    )
+    return {"status": meeting.status, "stage": stage}
+
+
+@router.get("/{meeting_id}/events")
+async def stream_meeting_events(meeting_id: int, db: AsyncSession = Depends(get_db)):
+    """Processing progress as Server-Sent Events; closes when the meeting completes or fails.
+
+    A meeting that is not being processed gets a single ``status`` event.
+    """
+    result = await db.execute(select(Meeting.status).where(Meeting.id == meeting_id))
+    status = result.scalar_one_or_none()
+    if status is None:
+        raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
+
+    if status == MeetingStatus.PROCESSING:
+        events = progress.event_stream(meeting_id)
+    else:
+        events = iter([progress.status_event(meeting_id, status.value)])
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{meeting_id}/participants", response_model=list[ParticipantOut])
@@ -134,5 +403,7 @@ async def update_participant(
         participant.email = data.email
 
     await db.commit()
+    # The name appears in the meeting detail, transcript and task responses.
+    await response_cache.invalidate_meeting(meeting_id)
     await db.refresh(participant)
     return participant
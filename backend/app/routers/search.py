@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Float, Integer, cast, func, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models.meeting import Meeting
+from app.models.summary import Summary
+from app.models.task import Task
+from app.models.transcript import TranscriptSegment
+from app.schemas.search import SearchHit, SearchKind
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+TS_CONFIG = "turkish"
+_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+
+
+def _matches(kind: SearchKind, model, body, tsquery, meeting_id: int | None, limit: int):
+    start_time = TranscriptSegment.start_time if model is TranscriptSegment else cast(null(), Float)
+    segment_order = (
+        TranscriptSegment.segment_order if model is TranscriptSegment else cast(null(), Integer)
+    )
+    rank = func.ts_rank_cd(model.search_vector, tsquery)
+    query = select(
+        literal(kind.value).label("kind"),
+        model.id.label("id"),
+        model.meeting_id.label("meeting_id"),
+        body.label("body"),
+        start_time.label("start_time"),
+        segment_order.label("segment_order"),
+        rank.label("rank"),
+    ).where(model.search_vector.op("@@")(tsquery))
+    if meeting_id is not None:
+        query = query.where(model.meeting_id == meeting_id)
+    # Every match is ranked; only each source's best ``limit`` reach the union,
+    # which still holds the overall top ``limit``.
+    return query.order_by(rank.desc()).limit(limit)
+
+
+def search_query(q: str, kinds: list[SearchKind], meeting_id: int | None, limit: int):
+    """The top ``limit`` hits for ``q`` with their snippets, best first."""
+    tsquery = func.websearch_to_tsquery(TS_CONFIG, q)
+    sources = {
+        SearchKind.SEGMENT: (TranscriptSegment, TranscriptSegment.text),
+        SearchKind.SUMMARY: (Summary, Summary.full_summary),
+        SearchKind.TASK: (Task, Task.title),
+    }
+    parts = [
+        _matches(kind, *sources[kind], tsquery, meeting_id, limit) for kind in dict.fromkeys(kinds)
+    ]
+    matches = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+
+    # Snippets are generated for the top hits only; ts_headline re-parses the text.
+    top = select(matches).order_by(matches.c.rank.desc()).limit(limit).subquery()
+    return (
+        select(
+            top.c.kind,
+            top.c.id,
+            top.c.meeting_id,
+            Meeting.title.label("meeting_title"),
+            func.ts_headline(TS_CONFIG, top.c.body, tsquery, _HEADLINE_OPTIONS).label("snippet"),
+            top.c.rank,
+            top.c.start_time,
+            top.c.segment_order,
+        )
+        .join(Meeting, Meeting.id == top.c.meeting_id)
+        .order_by(top.c.rank.desc())
+    )
+
+
+@router.get("", response_model=list[SearchHit])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kinds: list[SearchKind] = Query(list(SearchKind)),
+    meeting_id: int | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """Ranked matches in transcripts, summaries and task titles (web search syntax)."""
+    result = await db.execute(search_query(q, kinds, meeting_id, limit))
+    return [SearchHit.model_validate(row) for row in result]
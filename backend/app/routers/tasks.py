@@ -1,21 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import inspect, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import get_db
-from app.models.task import Task, TaskStatus
+from app.models.participant import Participant
+from app.models.task import Task, TaskPriority, TaskStatus
 from app.schemas.task import TaskCreate, TaskOut, TaskUpdate
+from app.services import response_cache
+from app.services.pagination import decode_cursor, set_next_cursor
 
 router = APIRouter(tags=["tasks"])
 
 
-def _task_to_out(task: Task) -> TaskOut:
+def _task_to_out(task: Task, assignee_name: str | None = None) -> TaskOut:
+    if assignee_name is None and "assignee" not in inspect(task).unloaded:
+        assignee_name = task.assignee.name if task.assignee else None
     return TaskOut(
         id=task.id,
         meeting_id=task.meeting_id,
         assignee_id=task.assignee_id,
-        assignee_name=task.assignee.name if task.assignee else None,
+        assignee_name=assignee_name,
         title=task.title,
         description=task.description,
         priority=task.priority,
@@ -27,26 +34,74 @@ def _task_to_out(task: Task) -> TaskOut:
 
 
 @router.get("/api/meetings/{meeting_id}/tasks", response_model=list[TaskOut])
-async def get_meeting_tasks(meeting_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Task)
-        .options(selectinload(Task.assignee))
-        .where(Task.meeting_id == meeting_id)
-        .order_by(Task.created_at)
+async def get_meeting_tasks(
+    meeting_id: int, request: Request, db: AsyncSession = Depends(get_db)
+):
+    async def build():
+        result = await db.execute(
+            select(Task)
+            .options(selectinload(Task.assignee))
+            .where(Task.meeting_id == meeting_id)
+            .order_by(Task.created_at)
+        )
+        return [_task_to_out(t) for t in result.scalars().all()]
+
+    return await response_cache.cached_response(request, meeting_id, "tasks", build)
+
+
+def task_list_query(
+    status: TaskStatus | None = None,
+    assignee_id: int | None = None,
+    priority: TaskPriority | None = None,
+    meeting_id: int | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    cursor: str | None = None,
+):
+    """Tasks with their assignee's name, oldest first; the caller applies the limit."""
+    # Only the assignee's name is needed, so join it instead of loading Participant rows.
+    query = (
+        select(Task, Participant.name)
+        .outerjoin(Participant, Task.assignee_id == Participant.id)
+        .order_by(Task.created_at, Task.id)
     )
-    return [_task_to_out(t) for t in result.scalars().all()]
+    if status:
+        query = query.where(Task.status == status)
+    if assignee_id is not None:
+        query = query.where(Task.assignee_id == assignee_id)
+    if priority:
+        query = query.where(Task.priority == priority)
+    if meeting_id is not None:
+        query = query.where(Task.meeting_id == meeting_id)
+    if due_from:
+        query = query.where(Task.due_date >= due_from)
+    if due_to:
+        query = query.where(Task.due_date <= due_to)
+    if cursor:
+        query = query.where(tuple_(Task.created_at, Task.id) > decode_cursor(cursor))
+    return query
 
 
 @router.get("/api/tasks", response_model=list[TaskOut])
 async def list_all_tasks(
+    response: Response,
     status: TaskStatus | None = Query(None),
+    assignee_id: int | None = Query(None),
+    priority: TaskPriority | None = Query(None),
+    meeting_id: int | None = Query(None),
+    due_from: date | None = Query(None),
+    due_to: date | None = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Task).options(selectinload(Task.assignee)).order_by(Task.created_at)
-    if status:
-        query = query.where(Task.status == status)
-    result = await db.execute(query)
-    return [_task_to_out(t) for t in result.scalars().all()]
+    """Oldest first; the next page's cursor is returned in the X-Next-Cursor header."""
+    query = task_list_query(
+        status, assignee_id, priority, meeting_id, due_from, due_to, cursor
+    )
+    result = await db.execute(query.limit(limit + 1))
+    rows = set_next_cursor(response, [tuple(row) for row in result], limit)
+    return [_task_to_out(task, name) for task, name in rows]
 
 
 @router.post("/api/meetings/{meeting_id}/tasks", response_model=TaskOut, status_code=201)
@@ -65,6 +120,7 @@ async def create_task(
     )
     db.add(task)
     await db.commit()
+    await response_cache.invalidate_meeting(meeting_id)
     await db.refresh(task, ["assignee"])
     return _task_to_out(task)
 
@@ -86,5 +142,6 @@ async def update_task(
         setattr(task, field, value)
 
     await db.commit()
+    await response_cache.invalidate_meeting(task.meeting_id)
     await db.refresh(task, ["assignee"])
     return _task_to_out(task)
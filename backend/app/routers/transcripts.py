@@ -1,67 +1,122 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import async_session, get_db
 from app.models.meeting import Meeting
+from app.models.participant import Participant
 from app.models.summary import Summary
 from app.models.transcript import TranscriptSegment
 from app.schemas.report import SummaryOut
 from app.schemas.transcript import TranscriptOut, TranscriptSegmentOut
+from app.services import response_cache
 
 router = APIRouter(prefix="/api/meetings", tags=["transcripts"])
 
+# Rows fetched per round trip when streaming from the server-side cursor.
+_STREAM_BATCH = 500
 
-@router.get("/{meeting_id}/transcript", response_model=TranscriptOut)
-async def get_transcript(meeting_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
-    meeting = result.scalar_one_or_none()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
 
-    result = await db.execute(
-        select(TranscriptSegment)
-        .options(selectinload(TranscriptSegment.participant))
-        .where(TranscriptSegment.meeting_id == meeting_id)
+def _segment_window(
+    time_from: float | None = Query(None, alias="from", ge=0),
+    time_to: float | None = Query(None, alias="to", ge=0),
+    order_from: int | None = Query(None, ge=0),
+    order_to: int | None = Query(None, ge=0),
+) -> list:
+    """Filters for segments overlapping [from, to] seconds and an inclusive order range."""
+    conditions = []
+    if time_from is not None:
+        conditions.append(TranscriptSegment.end_time > time_from)
+    if time_to is not None:
+        conditions.append(TranscriptSegment.start_time < time_to)
+    if order_from is not None:
+        conditions.append(TranscriptSegment.segment_order >= order_from)
+    if order_to is not None:
+        conditions.append(TranscriptSegment.segment_order <= order_to)
+    return conditions
+
+
+def _segment_query(meeting_id: int, conditions: list):
+    return (
+        select(
+            TranscriptSegment.id,
+            TranscriptSegment.speaker_label,
+            func.coalesce(Participant.name, TranscriptSegment.speaker_label).label(
+                "participant_name"
+            ),
+            TranscriptSegment.start_time,
+            TranscriptSegment.end_time,
+            TranscriptSegment.text,
+            TranscriptSegment.confidence,
+            TranscriptSegment.segment_order,
+        )
+        .outerjoin(Participant, TranscriptSegment.participant_id == Participant.id)
+        .where(TranscriptSegment.meeting_id == meeting_id, *conditions)
         .order_by(TranscriptSegment.segment_order)
     )
-    segments = result.scalars().all()
-
-    segment_outs = []
-    full_parts = []
-    for seg in segments:
-        name = seg.participant.name if seg.participant else seg.speaker_label
-        segment_outs.append(
-            TranscriptSegmentOut(
-                id=seg.id,
-                speaker_label=seg.speaker_label,
-                participant_name=name,
-                start_time=seg.start_time,
-                end_time=seg.end_time,
-                text=seg.text,
-                confidence=seg.confidence,
-                segment_order=seg.segment_order,
-            )
-        )
-        full_parts.append(f"[{name}]: {seg.text}")
 
-    return TranscriptOut(
-        meeting_id=meeting_id,
-        segments=segment_outs,
-        full_text="\n".join(full_parts),
-    )
+
+async def _ensure_meeting(db: AsyncSession, meeting_id: int) -> None:
+    result = await db.execute(select(Meeting.id).where(Meeting.id == meeting_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Toplantı bulunamadı")
+
+
+@router.get("/{meeting_id}/transcript", response_model=TranscriptOut)
+async def get_transcript(
+    meeting_id: int,
+    request: Request,
+    include_full_text: bool = Query(True),
+    conditions: list = Depends(_segment_window),
+    db: AsyncSession = Depends(get_db),
+):
+    async def build():
+        await _ensure_meeting(db, meeting_id)
+        result = await db.execute(_segment_query(meeting_id, conditions))
+        segments = [TranscriptSegmentOut.model_validate(row) for row in result]
+
+        full_text = None
+        if include_full_text:
+            full_text = "\n".join(f"[{seg.participant_name}]: {seg.text}" for seg in segments)
+        return TranscriptOut(meeting_id=meeting_id, segments=segments, full_text=full_text)
+
+    return await response_cache.cached_response(request, meeting_id, "transcript", build)
+
+
+@router.get("/{meeting_id}/transcript/stream")
+async def stream_transcript(
+    meeting_id: int,
+    conditions: list = Depends(_segment_window),
+    db: AsyncSession = Depends(get_db),
+):
+    """Segments as NDJSON, one object per line, read through a server-side cursor."""
+    await _ensure_meeting(db, meeting_id)
+    query = _segment_query(meeting_id, conditions).execution_options(yield_per=_STREAM_BATCH)
+
+    async def lines():
+        # The request's session is closed before the body is sent, so the
+        # cursor gets a session of its own.
+        async with async_session() as session:
+            result = await session.stream(query)
+            async for row in result:
+                yield TranscriptSegmentOut.model_validate(row).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/{meeting_id}/summary", response_model=SummaryOut)
-async def get_summary(meeting_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Summary).where(Summary.meeting_id == meeting_id)
-    )
-    summary = result.scalar_one_or_none()
-    if not summary:
-        raise HTTPException(status_code=404, detail="Özet henüz oluşturulmamış")
-    return summary
+async def get_summary(meeting_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    async def build():
+        result = await db.execute(
+            select(Summary).where(Summary.meeting_id == meeting_id)
+        )
+        summary = result.scalar_one_or_none()
+        if not summary:
+            raise HTTPException(status_code=404, detail="Özet henüz oluşturulmamış")
+        return SummaryOut.model_validate(summary)
+
+    return await response_cache.cached_response(request, meeting_id, "summary", build)
 
 
 @router.post("/{meeting_id}/summary/regenerate", response_model=SummaryOut)
@@ -2,13 +2,14 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
-from app.models.meeting import MeetingStatus
+from app.models.meeting import AsrPolicy, MeetingStatus
 
 
 class MeetingCreate(BaseModel):
     title: str
     description: str | None = None
     date: datetime | None = None
+    asr_policy: AsrPolicy | None = None
 
 
 class ParticipantOut(BaseModel):
@@ -32,6 +33,12 @@ class MeetingOut(BaseModel):
     date: datetime
     duration_seconds: int | None
     status: MeetingStatus
+    processing_stage: str | None = None
+    asr_policy: AsrPolicy | None = None
+    transcript_draft: bool = False
+    audio_seconds: float | None = None
+    silence_seconds: float | None = None
+    asr_seconds: float | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,23 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class SearchKind(str, Enum):
+    SEGMENT = "segment"
+    SUMMARY = "summary"
+    TASK = "task"
+
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: int
+    meeting_id: int
+    meeting_title: str
+    snippet: str
+    rank: float
+    # Jump-to position in the recording, for transcript segments
+    start_time: float | None = None
+    segment_order: int | None = None
+
+    model_config = {"from_attributes": True}
@@ -17,4 +17,4 @@ class TranscriptSegmentOut(BaseModel):
 class TranscriptOut(BaseModel):
     meeting_id: int
     segments: list[TranscriptSegmentOut]
-    full_text: str
+    full_text: str | None = None
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int = Field(gt=0)
+    chunk_size: int | None = Field(default=None, ge=256 * 1024)
+
+
+class UploadSessionOut(BaseModel):
+    upload_id: str
+    meeting_id: int
+    filename: str
+    size: int
+    chunk_size: int
+    total_chunks: int
+    offset: int
+    received_chunks: list[int]
@@ -0,0 +1,194 @@
+"""Decoded-audio cache: 16 kHz mono float32 PCM stored as memory-mapped ``.npy`` files.
+
+``whisperx.load_audio`` runs ffmpeg over the whole upload, so the decoded
+samples are written once per distinct file content and every later reader
+(retries, reprocessing, chunk workers in other processes) maps the same
+pages read-only instead of decoding or copying again. Entries of recordings
+that a job has ``pinned`` are never evicted.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+from app.services.vad import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+_HASH_BLOCK = 1024 * 1024
+# Pins left behind by a crashed process stop protecting their entries after this.
+_PIN_STALE_SECONDS = 24 * 3600
+
+
+def file_sha256(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_audio(audio_path: str, content_hash: str | None = None) -> np.memmap:
+    """Return the decoded audio for ``audio_path`` as a read-only memory map.
+
+    Decodes with ffmpeg and populates the cache on a miss.
+    """
+    content_hash = content_hash or file_sha256(audio_path)
+    cached = _entry_path(content_hash)
+    if (audio := _open_entry(cached)) is not None:
+        logger.info("Decoded audio cache hit: %s", cached.name)
+        return audio
+
+    import whisperx
+
+    logger.info("Decoding audio: %s", audio_path)
+    audio = whisperx.load_audio(audio_path)
+
+    cache_dir = _cache_dir()
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, audio.astype(np.float32, copy=False))
+        os.replace(tmp, cached)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    del audio
+
+    _evict(keep=cached)
+    return np.load(cached, mmap_mode="r")
+
+
+def load_speech_audio(
+    audio: np.ndarray, content_hash: str, regions: list[tuple[float, float]]
+) -> np.memmap:
+    """Return only the ``regions`` (seconds) of ``audio``, laid end to end, as a memory map.
+
+    The result is cached next to the full recording, keyed by its regions, and
+    written region by region so the speech never has to fit in memory at once.
+    Call it under ``pinned(content_hash)``: the pin keeps the copy from
+    eviction while it is in use and removes it afterwards.
+    """
+    regions_key = hashlib.blake2b(repr(regions).encode(), digest_size=8).hexdigest()
+    cached = _cache_dir() / f"{content_hash}.speech-{regions_key}.npy"
+    if (speech := _open_entry(cached)) is not None:
+        return speech
+
+    spans = [(int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)) for start, end in regions]
+    fd, tmp = tempfile.mkstemp(dir=_cache_dir(), suffix=".tmp")
+    os.close(fd)
+    try:
+        out = np.lib.format.open_memmap(
+            tmp, mode="w+", dtype=np.float32, shape=(sum(end - start for start, end in spans),)
+        )
+        offset = 0
+        for start, end in spans:
+            out[offset : offset + end - start] = audio[start:end]
+            offset += end - start
+        out.flush()
+        del out
+        os.replace(tmp, cached)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    _evict(keep=cached)
+    return np.load(cached, mmap_mode="r")
+
+
+@contextmanager
+def pinned(content_hash: str):
+    """Protect the cache entries of ``content_hash`` from eviction for the block.
+
+    The pin is a file in the cache directory, so it holds for every process
+    sharing the cache. When the last pin of a recording is released its
+    speech-only copies are removed: they are cheap to rebuild from the full
+    entry and would otherwise double its footprint in the cache.
+    """
+    fd, pin = tempfile.mkstemp(dir=_cache_dir(), prefix=f"{content_hash}.", suffix=".pin")
+    os.close(fd)
+    try:
+        yield
+    finally:
+        Path(pin).unlink(missing_ok=True)
+        if content_hash not in _pinned_hashes():
+            _discard_speech(content_hash)
+
+
+def open_cached(cache_file: str) -> np.memmap:
+    """Map an existing cache entry, e.g. in a chunk worker handed ``memmap.filename``."""
+    return np.load(cache_file, mmap_mode="r")
+
+
+def discard(content_hash: str) -> None:
+    _entry_path(content_hash).unlink(missing_ok=True)
+    _discard_speech(content_hash)
+
+
+def _discard_speech(content_hash: str) -> None:
+    # A reader that mapped the file already keeps its pages; one that had not
+    # yet opened it sees a miss and writes it again.
+    for path in _cache_dir().glob(f"{content_hash}.speech-*.npy"):
+        path.unlink(missing_ok=True)
+
+
+def _open_entry(path: Path) -> np.memmap | None:
+    try:
+        os.utime(path)  # LRU bookkeeping
+        return np.load(path, mmap_mode="r")
+    except FileNotFoundError:  # missing, or evicted just now
+        return None
+
+
+def _pinned_hashes() -> set[str]:
+    hashes = set()
+    stale_before = time.time() - _PIN_STALE_SECONDS
+    for pin in _cache_dir().glob("*.pin"):
+        try:
+            if pin.stat().st_mtime < stale_before:
+                pin.unlink(missing_ok=True)
+                continue
+        except FileNotFoundError:
+            continue
+        hashes.add(pin.name.split(".", 1)[0])
+    return hashes
+
+
+def _evict(keep: Path) -> None:
+    budget = settings.audio_cache_max_mb * 1024 * 1024
+    pinned_hashes = _pinned_hashes()
+    entries = []
+    for path in _cache_dir().glob("*.npy"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        if path == keep or path.name.split(".", 1)[0] in pinned_hashes:
+            continue
+        # Readers that already mapped the file keep their pages until they close it.
+        path.unlink(missing_ok=True)
+        total -= size
+        logger.info("Evicted decoded audio %s", path.name)
+
+
+def _entry_path(content_hash: str) -> Path:
+    return _cache_dir() / f"{content_hash}.npy"
+
+
+def _cache_dir() -> Path:
+    path = Path(settings.audio_cache_dir or Path(settings.upload_dir) / ".audio_cache")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
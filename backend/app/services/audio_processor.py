@@ -1,17 +1,52 @@
 """Audio processing pipeline using WhisperX for transcription + speaker diarization."""
 
+import functools
+import inspect
 import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
+import pandas as pd
 import whisperx
+from whisperx.audio import SAMPLE_RATE
 
 from app.config import settings
+from app.services import audio_cache
+from app.services.checkpoints import StageCheckpoints
+from app.services.model_registry import (
+    configure_torch_threads,
+    cpu_allocation,
+    get_device,
+    registry,
+    whisper_size_mb,
+)
+from app.services.progress import ProgressReporter
+from app.services.vad import SpeechIndex, find_split_points, speech_regions
 
 logger = logging.getLogger(__name__)
 
+DRAFT_SPEAKER = "SPEAKER_00"
 
-def process_audio(audio_path: str) -> list[dict]:
+
+def process_audio(
+    audio_path: str,
+    content_hash: str | None = None,
+    checkpoints: StageCheckpoints | None = None,
+    progress: ProgressReporter | None = None,
+    draft: bool = False,
+) -> list[dict]:
     """Process an audio file: transcribe and perform speaker diarization.
 
+    With ``checkpoints``, each stage's output is saved as it completes and
+    stages that already have a checkpoint are skipped. With ``progress``,
+    stage boundaries and transcription progress are published. A ``draft``
+    run uses the small draft model and skips alignment and diarization, so
+    every segment is attributed to ``DRAFT_SPEAKER``.
+
+    Silence found by the VAD pre-pass is cut out before transcription and
+    diarization; segment times are mapped back to the original recording.
+
     Returns a list of segments:
     [
         {
@@ -23,40 +58,148 @@ def process_audio(audio_path: str) -> list[dict]:
         ...
     ]
     """
-    device = "cuda" if _cuda_available() else "cpu"
-    compute_type = "float16" if device == "cuda" else "int8"
-
-    logger.info("Loading Whisper model: %s (device=%s)", settings.whisper_model, device)
-    model = whisperx.load_model(
-        settings.whisper_model,
-        device,
-        compute_type=compute_type,
-        language=settings.whisper_language,
+    if checkpoints is not None and (segments := checkpoints.get("assign")) is not None:
+        return segments
+
+    configure_torch_threads()
+    decoded = _run_stage(
+        checkpoints,
+        progress,
+        "decode",
+        lambda: {"content_hash": content_hash or audio_cache.file_sha256(audio_path)},
     )
+    # Keep the cached audio from eviction until every reader, chunk workers
+    # in other processes included, is done with it.
+    with audio_cache.pinned(decoded["content_hash"]):
+        return _process(audio_path, decoded["content_hash"], checkpoints, progress, draft)
 
-    # 1. Transcribe
-    logger.info("Transcribing audio: %s", audio_path)
-    audio = whisperx.load_audio(audio_path)
-    result = model.transcribe(audio, batch_size=16, language=settings.whisper_language)
 
-    # 2. Align whisper output for word-level timestamps
-    logger.info("Aligning transcript...")
-    model_a, metadata = whisperx.load_align_model(
-        language_code=settings.whisper_language, device=device
-    )
-    result = whisperx.align(
-        result["segments"], model_a, metadata, audio, device, return_char_alignments=False
-    )
+def _process(
+    audio_path: str,
+    content_hash: str,
+    checkpoints: StageCheckpoints | None,
+    progress: ProgressReporter | None,
+    draft: bool,
+) -> list[dict]:
+    device, compute_type = get_device()
+    audio = audio_cache.load_audio(audio_path, content_hash)
+    index = _speech_index(audio, checkpoints, progress)
+    if index.silence_seconds:
+        audio = audio_cache.load_speech_audio(audio, content_hash, index.regions)
 
-    # 3. Speaker diarization
-    logger.info("Performing speaker diarization...")
-    diarize_model = whisperx.DiarizationPipeline(
-        use_auth_token=settings.hf_token, device=device
+    if draft:
+        raw_segments = _run_stage(
+            checkpoints,
+            progress,
+            "transcribe",
+            lambda: _transcribe(
+                audio,
+                device,
+                settings.draft_compute_type,
+                progress,
+                model_name=settings.draft_whisper_model,
+            ),
+        )
+        return _run_stage(
+            checkpoints,
+            progress,
+            "assign",
+            lambda: _to_original(
+                [
+                    {
+                        "speaker": DRAFT_SPEAKER,
+                        "start": seg["start"],
+                        "end": seg["end"],
+                        "text": seg["text"].strip(),
+                    }
+                    for seg in raw_segments
+                ],
+                index,
+            ),
+        )
+
+    def transcribe_and_align():
+        raw_segments = _run_stage(
+            checkpoints,
+            progress,
+            "transcribe",
+            lambda: _transcribe(audio, device, compute_type, progress),
+        )
+        return _run_stage(
+            checkpoints, progress, "align", lambda: _align(raw_segments, audio, device)
+        )
+
+    def diarize():
+        return _run_stage(checkpoints, progress, "diarize", lambda: _diarize(audio, device))
+
+    if settings.parallel_diarization:
+        # Diarization only needs the decoded audio, so it runs next to
+        # transcribe + align; both stages spend their time in native code
+        # that releases the GIL.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarize") as pool:
+            diarize_future = pool.submit(diarize)
+            result = transcribe_and_align()
+            diarize_segments = diarize_future.result()
+    else:
+        result = transcribe_and_align()
+        diarize_segments = diarize()
+
+    segments = _run_stage(
+        checkpoints,
+        progress,
+        "assign",
+        lambda: _to_original(_assign_speakers(diarize_segments, result), index),
     )
-    diarize_segments = diarize_model(audio)
-    result = whisperx.assign_word_speakers(diarize_segments, result)
+    logger.info("Processed %d segments (model cache: %s)", len(segments), registry.snapshot())
+    return segments
+
+
+def _speech_index(
+    audio, checkpoints: StageCheckpoints | None, progress: ProgressReporter | None
+) -> SpeechIndex:
+    duration = len(audio) / SAMPLE_RATE
+    if not settings.vad_enabled or (
+        checkpoints is not None
+        and checkpoints.get("vad") is None
+        and checkpoints.get("transcribe") is not None
+    ):
+        # A transcript made without the pre-pass (e.g. by a live session) is
+        # on the full timeline, so the later stages must be as well.
+        return SpeechIndex.full(duration)
+
+    def find_speech():
+        regions = speech_regions(
+            audio, settings.vad_min_silence_seconds, settings.vad_pad_seconds
+        )
+        # A recording with no detectable speech is likely just quiet; keep all of it.
+        index = SpeechIndex(regions, duration) if regions else SpeechIndex.full(duration)
+        logger.info(
+            "VAD: %.0fs of %.0fs is silence (%.0f%%), skipped by ASR and diarization",
+            index.silence_seconds,
+            duration,
+            100 * index.silence_ratio,
+        )
+        return index.to_dict()
+
+    return SpeechIndex(**_run_stage(checkpoints, progress, "vad", find_speech))
+
 
-    # 4. Build output segments
+def _to_original(segments: list[dict], index: SpeechIndex) -> list[dict]:
+    """Map segment times from the speech-only audio back to the recording."""
+    return [
+        {
+            **seg,
+            "start": index.to_original(seg["start"]),
+            "end": index.to_original(seg["end"], end=True),
+        }
+        for seg in segments
+    ]
+
+
+def _assign_speakers(diarize_segments: list[dict], aligned: dict) -> list[dict]:
+    result = whisperx.assign_word_speakers(pd.DataFrame(diarize_segments), aligned)
+
+    # Build output segments
     segments = []
     for i, seg in enumerate(result["segments"]):
         segments.append(
@@ -67,15 +210,180 @@ def process_audio(audio_path: str) -> list[dict]:
                 "text": seg["text"].strip(),
             }
         )
+    return segments
+
+
+def _run_stage(
+    checkpoints: StageCheckpoints | None,
+    progress: ProgressReporter | None,
+    stage: str,
+    compute,
+):
+    if checkpoints is not None:
+        data = checkpoints.get(stage)
+        if data is not None:
+            return data
+    started = time.perf_counter()
+    if progress is None:
+        data = compute()
+    else:
+        with progress.stage(stage):
+            data = compute()
+    if checkpoints is not None:
+        checkpoints.record_time(stage, time.perf_counter() - started)
+        checkpoints.put(stage, data)
+    return data
+
 
-    logger.info("Processed %d segments", len(segments))
+def _transcribe(
+    audio,
+    device: str,
+    compute_type: str,
+    progress: ProgressReporter | None = None,
+    model_name: str | None = None,
+) -> list[dict]:
+    # 1. Transcribe
+    model_name = model_name or settings.whisper_model
+    duration = len(audio) / SAMPLE_RATE
+    logger.info("Transcribing audio (%.0fs) with %s", duration, model_name)
+    if settings.asr_chunk_workers > 1 and duration > 2 * settings.asr_chunk_seconds:
+        return _transcribe_chunked(audio, device, compute_type, progress, model_name)
+    model = registry.whisper(model_name, settings.whisper_language, device, compute_type)
+    options = {}
+    if progress is not None and _accepts_progress_callback(type(model)):
+
+        def callback(percent: float) -> None:
+            progress.transcribed(duration * percent / 100, duration)
+
+        options["progress_callback"] = callback
+
+    result = model.transcribe(
+        audio, batch_size=16, language=settings.whisper_language, **options
+    )
+    return result["segments"]
+
+
+@functools.cache
+def _accepts_progress_callback(pipeline_type: type) -> bool:
+    # Only recent WhisperX releases report progress; older ones reject the keyword.
+    return "progress_callback" in inspect.signature(pipeline_type.transcribe).parameters
+
+
+def _align(raw_segments: list[dict], audio, device: str) -> dict:
+    # 2. Align whisper output for word-level timestamps
+    logger.info("Aligning transcript...")
+    model_a, metadata = registry.align(settings.whisper_language, device)
+    return whisperx.align(
+        raw_segments, model_a, metadata, audio, device, return_char_alignments=False
+    )
+
+
+def _diarize(audio, device: str) -> list[dict]:
+    # 3. Speaker diarization
+    logger.info("Performing speaker diarization...")
+    diarize_model = registry.diarizer(device)
+    diarize_segments = diarize_model(audio)
+    return diarize_segments[["start", "end", "speaker"]].to_dict("records")
+
+
+def _transcribe_chunked(
+    audio,
+    device: str,
+    compute_type: str,
+    progress: ProgressReporter | None = None,
+    model_name: str | None = None,
+) -> list[dict]:
+    """Transcribe silence-bounded chunks in a process pool and stitch the results.
+
+    Every chunk is decoded with ``asr_chunk_overlap_seconds`` of extra audio on
+    both sides so words at the cut are heard in full; a segment is then kept
+    only by the chunk whose own span contains its midpoint.
+    """
+    cuts = find_split_points(audio, settings.asr_chunk_seconds)
+    overlap = settings.asr_chunk_overlap_seconds
+    logger.info("Transcribing %d chunks on %d workers", len(cuts) - 1, settings.asr_chunk_workers)
+
+    pool = _chunk_pool(model_name or settings.whisper_model, device, compute_type)
+    futures = []
+    for own_start, own_end in zip(cuts, cuts[1:]):
+        start = max(0.0, own_start - overlap)
+        end = min(cuts[-1], own_end + overlap)
+        # Workers map the cached .npy themselves; only the file name crosses processes.
+        future = pool.submit(
+            _transcribe_chunk,
+            audio.filename,
+            start,
+            end,
+            device,
+            compute_type,
+            model_name or settings.whisper_model,
+        )
+        futures.append((own_start, own_end, future))
+
+    if progress is not None:
+        spans = {future: own_end - own_start for own_start, own_end, future in futures}
+        done = 0.0
+        for future in as_completed(spans):
+            done += spans[future]
+            progress.transcribed(done, cuts[-1])
+
+    segments = []
+    for own_start, own_end, future in futures:
+        for seg in future.result():
+            midpoint = (seg["start"] + seg["end"]) / 2
+            if own_start <= midpoint < own_end:
+                segments.append(seg)
+    segments.sort(key=lambda seg: seg["start"])
     return segments
 
 
-def _cuda_available() -> bool:
-    try:
-        import torch
+def _transcribe_chunk(
+    cache_file: str,
+    start: float,
+    end: float,
+    device: str,
+    compute_type: str,
+    model_name: str,
+) -> list[dict]:
+    """Pool worker: transcribe one chunk and shift its timestamps to the full timeline."""
+    audio = audio_cache.open_cached(cache_file)
+    chunk = audio[int(start * SAMPLE_RATE) : int(end * SAMPLE_RATE)]
+    model = registry.whisper(model_name, settings.whisper_language, device, compute_type)
+    result = model.transcribe(chunk, batch_size=16, language=settings.whisper_language)
+    return [
+        {**seg, "start": seg["start"] + start, "end": seg["end"] + start}
+        for seg in result["segments"]
+    ]
+
+
+def _chunk_pool(model_name: str, device: str, compute_type: str) -> ProcessPoolExecutor:
+    """The process pool for chunks, cached in the model registry.
+
+    The pool lives as long as the registry keeps it, so each process keeps
+    its model loaded between meetings. It is charged one model per process
+    against the registry budget and shut down when evicted.
+    """
+    workers = settings.asr_chunk_workers
+    threads = max(1, cpu_allocation()[0] // workers)
+
+    def load():
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_chunk_worker,
+            initargs=(threads,),
+        )
+
+    return registry.get(
+        ("asr_pool", model_name, settings.whisper_language, device, compute_type, threads),
+        load,
+        workers * whisper_size_mb(model_name, compute_type),
+        close=lambda pool: pool.shutdown(wait=False),
+    )
+
 
-        return torch.cuda.is_available()
-    except ImportError:
-        return False
+def _init_chunk_worker(threads: int) -> None:
+    settings.asr_threads = threads
+    settings.diarization_threads = threads
+    settings.parallel_diarization = False
+    configure_torch_threads()
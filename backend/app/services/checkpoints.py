@@ -0,0 +1,111 @@
+"""Per-meeting stage checkpoints for the processing pipeline.
+
+ASR stages (decode, vad, transcribe, align, diarize, assign) store their output as JSON
+files so a retry can pick up after the last finished stage, next to the wall
+time each took. Database stages
+(persist, summarize, extract_tasks) are marked on ``Meeting.processing_stage``
+in the same transaction as their writes.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STAGES = (
+    "decode",
+    "vad",
+    "transcribe",
+    "align",
+    "diarize",
+    "assign",
+    "persist",
+    "summarize",
+    "extract_tasks",
+)
+# Stages whose wall time is recorded as the meeting's ASR compute time
+ASR_STAGES = ("transcribe", "align", "diarize")
+
+
+def stage_done(completed: str | None, stage: str) -> bool:
+    """Return True if ``stage`` is at or before the ``completed`` stage."""
+    if completed is None:
+        return False
+    return STAGES.index(stage) <= STAGES.index(completed)
+
+
+class StageCheckpoints:
+    """Checkpoints of one meeting; ``variant`` keeps a side run (e.g. "refine") apart."""
+
+    def __init__(self, meeting_id: int, variant: str = ""):
+        self.meeting_id = meeting_id
+        suffix = f"_{variant}" if variant else ""
+        self.path = _checkpoint_root() / f"meeting_{meeting_id}{suffix}"
+
+    def get(self, stage: str) -> Any | None:
+        file = self.path / f"{stage}.json"
+        if not file.exists():
+            return None
+        try:
+            data = json.loads(file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Ignoring unreadable checkpoint %s", file)
+            return None
+        logger.info("Meeting %d: resuming from %s checkpoint", self.meeting_id, stage)
+        return data
+
+    def put(self, stage: str, data: Any) -> None:
+        self._write(f"{stage}.json", data)
+
+    def record_time(self, stage: str, seconds: float) -> None:
+        """Store the wall time a stage took to compute, kept across retries."""
+        self._write(f"{stage}.seconds", round(seconds, 3))
+
+    def times(self) -> dict[str, float]:
+        """Wall time of each stage that was computed, not resumed, in this run."""
+        times = {}
+        for file in self.path.glob("*.seconds"):
+            try:
+                times[file.stem] = float(file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("Ignoring unreadable stage time %s", file)
+        return times
+
+    def last_completed(self) -> str | None:
+        done = [stage for stage in STAGES if (self.path / f"{stage}.json").exists()]
+        return done[-1] if done else None
+
+    def clear(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _write(self, name: str, data: Any) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, default=_to_json)
+            os.replace(tmp, self.path / name)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _checkpoint_root() -> Path:
+    return Path(settings.checkpoint_dir or Path(settings.upload_dir) / ".checkpoints")
@@ -0,0 +1,132 @@
+"""Reuse pipeline results for recordings that were already processed.
+
+Uploads are identified by their SHA-256. When a completed meeting has the same
+audio and was transcribed with the current model and language, its
+participants, transcript, summary and extracted tasks are copied to the new
+meeting instead of running ASR and the LLM stages again.
+"""
+
+import logging
+
+from sqlalchemy import case, insert, literal, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.meeting import Meeting, MeetingStatus
+from app.models.participant import Participant
+from app.models.summary import Summary
+from app.models.task import Task
+from app.models.transcript import TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+
+async def find_processed_duplicate(db: AsyncSession, meeting: Meeting) -> Meeting | None:
+    if not meeting.audio_sha256:
+        return None
+    result = await db.execute(
+        select(Meeting)
+        .where(
+            Meeting.audio_sha256 == meeting.audio_sha256,
+            Meeting.id != meeting.id,
+            Meeting.status == MeetingStatus.COMPLETED,
+            Meeting.asr_model == settings.whisper_model,
+            Meeting.asr_language == settings.whisper_language,
+        )
+        .order_by(Meeting.updated_at.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def clone_meeting_results(db: AsyncSession, source: Meeting, target: Meeting) -> None:
+    """Copy processing output from ``source`` to ``target`` and mark it completed.
+
+    The caller commits.
+    """
+    result = await db.execute(select(Participant).where(Participant.meeting_id == source.id))
+    participants = list(result.scalars())
+    participant_ids: dict[int, int] = {}
+    if participants:
+        result = await db.execute(
+            insert(Participant).returning(Participant.id),
+            [
+                {
+                    "meeting_id": target.id,
+                    "name": p.name,
+                    "email": p.email,
+                    "speaker_label": p.speaker_label,
+                }
+                for p in participants
+            ],
+            execution_options={"sort_by_parameter_order": True},
+        )
+        participant_ids = {p.id: new_id for p, new_id in zip(participants, result.scalars())}
+
+    # Segments are copied inside the database, so a long meeting never has to
+    # pass through the API process.
+    participant_id = (
+        case(participant_ids, value=TranscriptSegment.participant_id)
+        if participant_ids
+        else null()
+    )
+    columns = (
+        "speaker_label",
+        "start_time",
+        "end_time",
+        "text",
+        "confidence",
+        "segment_order",
+    )
+    result = await db.execute(
+        insert(TranscriptSegment).from_select(
+            ["meeting_id", "participant_id", *columns],
+            select(
+                literal(target.id),
+                participant_id,
+                *(getattr(TranscriptSegment, column) for column in columns),
+            ).where(TranscriptSegment.meeting_id == source.id),
+        )
+    )
+    segments = result.rowcount
+
+    result = await db.execute(select(Summary).where(Summary.meeting_id == source.id))
+    summary = result.scalar_one_or_none()
+    if summary:
+        db.add(
+            Summary(
+                meeting_id=target.id,
+                full_summary=summary.full_summary,
+                key_points=summary.key_points,
+                decisions=summary.decisions,
+            )
+        )
+
+    # Extracted tasks are copied as fresh, pending action items.
+    result = await db.execute(select(Task).where(Task.meeting_id == source.id))
+    for task in result.scalars():
+        db.add(
+            Task(
+                meeting_id=target.id,
+                assignee_id=participant_ids.get(task.assignee_id),
+                title=task.title,
+                description=task.description,
+                priority=task.priority,
+                due_date=task.due_date,
+            )
+        )
+
+    target.duration_seconds = source.duration_seconds
+    target.asr_model = source.asr_model
+    target.asr_language = source.asr_language
+    target.transcript_draft = source.transcript_draft
+    target.audio_seconds = source.audio_seconds
+    target.silence_seconds = source.silence_seconds
+    target.processing_stage = "extract_tasks"
+    target.status = MeetingStatus.COMPLETED
+    logger.info(
+        "Meeting %d reuses results of meeting %d (%d segments)",
+        target.id,
+        source.id,
+        segments,
+    )
@@ -0,0 +1,438 @@
+"""Live transcription of a meeting streamed over a WebSocket.
+
+Incoming audio (16 kHz mono s16le PCM, or Opus/WebM/Ogg decoded by an ffmpeg
+subprocess) is cut into utterances with the energy VAD from ``vad``. Each
+finished utterance is transcribed with the cached Whisper model and its
+segments are stored right away, so the meeting is readable and searchable
+while it is still going on. The open utterance is re-transcribed every few
+seconds for partial text, which is pushed to the sender and to progress
+listeners but never stored.
+
+The raw audio is also written to a WAV file. When the stream ends the regular
+pipeline is enqueued: it aligns, diarizes and replaces the live rows with
+speaker-attributed segments, then runs the LLM stages. If the live model is
+the pipeline's own ``whisper_model``, the live transcript is saved as the
+``transcribe`` checkpoint and reused; otherwise the recording is transcribed
+again with the full model.
+"""
+
+import asyncio
+import json
+import logging
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import async_session
+from app.models.meeting import Meeting, MeetingStatus
+from app.services import audio_cache, progress, response_cache
+from app.services.checkpoints import StageCheckpoints
+from app.services.model_registry import get_device, registry
+from app.services.transcript_store import insert_segments
+from app.services.vad import FRAME_SECONDS, SAMPLE_RATE, frame_energies
+
+logger = logging.getLogger(__name__)
+
+LIVE_SPEAKER = "SPEAKER_00"  # until diarization runs on the full recording
+_FRAME = int(FRAME_SECONDS * SAMPLE_RATE)
+_PREROLL_FRAMES = int(0.2 / FRAME_SECONDS)
+_MIN_UTTERANCE_SECONDS = 0.3
+_FLUSH_BYTES = 1024 * 1024
+# Final utterances waiting for the model; when full the socket is not read.
+_MAX_QUEUED_UTTERANCES = 8
+
+_executor: ThreadPoolExecutor | None = None
+
+
+@dataclass
+class Utterance:
+    start: float  # seconds from the start of the stream
+    audio: np.ndarray
+    final: bool
+
+
+class StreamSegmenter:
+    """Cuts a PCM stream into utterances at pauses of ``silence_seconds``.
+
+    Speech is any 30 ms frame louder than three times the running noise floor.
+    Utterances longer than ``max_seconds`` are cut without waiting for a pause.
+    """
+
+    def __init__(self, silence_seconds: float, max_seconds: float, partial_seconds: float):
+        self.silence_frames = max(1, int(silence_seconds / FRAME_SECONDS))
+        self.max_frames = int(max_seconds / FRAME_SECONDS)
+        self.partial_frames = int(partial_seconds / FRAME_SECONDS)
+        self.noise_floor = 0.003
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._frames_seen = 0
+        self._preroll: list[np.ndarray] = []
+        self._speech: list[np.ndarray] = []
+        self._speech_start = 0
+        self._silence_run = 0
+        self._since_partial = 0
+
+    def feed(self, samples: np.ndarray) -> list[Utterance]:
+        audio = np.concatenate([self._pending, samples])
+        n_frames = len(audio) // _FRAME
+        self._pending = audio[n_frames * _FRAME :]
+        if n_frames == 0:
+            return []
+        frames = audio[: n_frames * _FRAME].reshape(n_frames, _FRAME)
+        out = []
+        for frame, energy in zip(frames, frame_energies(frames.ravel())):
+            utterance = self._step(frame, float(energy))
+            if utterance is not None:
+                out.append(utterance)
+            self._frames_seen += 1
+        return out
+
+    def flush(self) -> Utterance | None:
+        """Finish the open utterance at the end of the stream."""
+        return self._finish() if self._speech else None
+
+    def _step(self, frame: np.ndarray, energy: float) -> Utterance | None:
+        is_speech = energy > 3 * self.noise_floor
+        if not self._speech:
+            if not is_speech:
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * max(energy, 1e-4)
+                self._preroll = (self._preroll + [frame])[-_PREROLL_FRAMES:]
+                return None
+            self._speech = self._preroll + [frame]
+            self._speech_start = self._frames_seen - len(self._preroll)
+            self._preroll = []
+            self._silence_run = 0
+            self._since_partial = 0
+            return None
+
+        self._speech.append(frame)
+        self._silence_run = 0 if is_speech else self._silence_run + 1
+        self._since_partial += 1
+        if self._silence_run >= self.silence_frames or len(self._speech) >= self.max_frames:
+            return self._finish()
+        if self.partial_frames and self._since_partial >= self.partial_frames:
+            self._since_partial = 0
+            return Utterance(self._start_seconds(), np.concatenate(self._speech), final=False)
+        return None
+
+    def _finish(self) -> Utterance | None:
+        # Keep a little of the trailing pause; Whisper handles it better than a hard cut.
+        keep = len(self._speech) - max(0, self._silence_run - _PREROLL_FRAMES)
+        speech, start = self._speech[:keep], self._start_seconds()
+        self._speech, self._silence_run = [], 0
+        if len(speech) * FRAME_SECONDS < _MIN_UTTERANCE_SECONDS:
+            return None
+        return Utterance(start, np.concatenate(speech), final=True)
+
+    def _start_seconds(self) -> float:
+        return self._speech_start * FRAME_SECONDS
+
+
+class LiveSession:
+    """One live ingest stream for a meeting."""
+
+    def __init__(self, meeting_id: int, send):
+        self.meeting_id = meeting_id
+        self.send = send  # coroutine function taking a JSON-serializable dict
+        self.path = Path(settings.upload_dir) / f"meeting_{meeting_id}_live.wav"
+        self.segmenter = StreamSegmenter(
+            settings.live_silence_seconds,
+            settings.live_max_segment_seconds,
+            settings.live_partial_seconds,
+        )
+        self.segment_order = 0
+        self.transcript: list[dict] = []
+        self._queue: asyncio.Queue[Utterance | None] = asyncio.Queue(_MAX_QUEUED_UTTERANCES)
+        self._worker: asyncio.Task | None = None
+        self._wav: wave.Wave_write | None = None
+        self._pcm = bytearray()
+        self._odd_byte = b""
+        self._bytes_written = 0
+
+    async def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._wav = await run_in_threadpool(_open_wav, self.path)
+        self._worker = asyncio.create_task(self._transcribe_loop())
+
+    async def feed_pcm(self, data: bytes) -> None:
+        """Accept 16 kHz mono s16le PCM."""
+        data = self._odd_byte + data
+        if len(data) % 2:
+            data, self._odd_byte = data[:-1], data[-1:]
+        else:
+            self._odd_byte = b""
+        self._pcm += data
+        if len(self._pcm) >= _FLUSH_BYTES:
+            await self._flush_wav()
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+        for utterance in self.segmenter.feed(samples):
+            # Partial updates are dropped while the model is still busy; final
+            # ones wait for room, which holds back reading from the socket.
+            if utterance.final:
+                await self._enqueue(utterance)
+            elif self._queue.empty():
+                self._queue.put_nowait(utterance)
+
+    async def finish(self) -> None:
+        """Transcribe what is left, close the recording and hand over to the pipeline."""
+        last = self.segmenter.flush()
+        if last is not None:
+            await self._enqueue(last)
+        await self._enqueue(None)
+        await self._worker
+        await self._flush_wav()
+        await run_in_threadpool(self._wav.close)
+
+        if self._bytes_written == 0:
+            self.path.unlink(missing_ok=True)
+            await _set_status(self.meeting_id, MeetingStatus.UPLOADING)
+            return
+
+        sha256 = await run_in_threadpool(audio_cache.file_sha256, self.path)
+        checkpoints = StageCheckpoints(self.meeting_id)
+        await run_in_threadpool(checkpoints.put, "decode", {"content_hash": sha256})
+        if _live_model() == settings.whisper_model:
+            await run_in_threadpool(checkpoints.put, "transcribe", self.transcript)
+
+        async with async_session() as db:
+            meeting = await db.get(Meeting, self.meeting_id)
+            meeting.audio_file_path = str(self.path)
+            meeting.audio_sha256 = sha256
+            meeting.audio_size_bytes = self.path.stat().st_size
+            meeting.duration_seconds = int(self._bytes_written / 2 / SAMPLE_RATE)
+            await db.commit()
+        await response_cache.invalidate_meeting(self.meeting_id)
+
+        from app.workers.tasks import process_meeting_audio
+
+        process_meeting_audio.delay(self.meeting_id)
+        logger.info(
+            "Live stream of meeting %d ended: %d segments, %.0fs of audio",
+            self.meeting_id,
+            self.segment_order,
+            self._bytes_written / 2 / SAMPLE_RATE,
+        )
+
+    async def abort(self) -> None:
+        """Stop without handing over after an internal error; the meeting is marked failed."""
+        if self._worker is not None:
+            self._worker.cancel()
+        if self._wav is not None:
+            await run_in_threadpool(self._wav.close)
+        await _set_status(self.meeting_id, MeetingStatus.FAILED)
+        await progress.publish(self.meeting_id, "failed", status=MeetingStatus.FAILED.value)
+
+    async def _enqueue(self, utterance: Utterance | None) -> None:
+        # Waits for room, but fails instead of hanging if the transcriber died.
+        put = asyncio.ensure_future(self._queue.put(utterance))
+        await asyncio.wait({put, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            self._worker.result()
+            raise RuntimeError("Live transcription stopped")
+
+    async def _flush_wav(self) -> None:
+        if self._pcm:
+            data, self._pcm = bytes(self._pcm), bytearray()
+            await run_in_threadpool(self._wav.writeframes, data)
+            self._bytes_written += len(data)
+
+    async def _transcribe_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (utterance := await self._queue.get()) is not None:
+            segments = await loop.run_in_executor(
+                _get_executor(), _transcribe_utterance, utterance.audio
+            )
+            if utterance.final:
+                await self._store(utterance.start, segments)
+            else:
+                text = " ".join(seg["text"].strip() for seg in segments)
+                await self._notify("transcript_partial", start=utterance.start, text=text)
+
+    async def _store(self, offset: float, segments: list[dict]) -> None:
+        rows = []
+        for seg in segments:
+            text = seg["text"].strip()
+            if not text:
+                continue
+            start, end = round(offset + seg["start"], 3), round(offset + seg["end"], 3)
+            self.transcript.append({"start": start, "end": end, "text": seg["text"]})
+            rows.append(
+                {
+                    "meeting_id": self.meeting_id,
+                    "speaker_label": LIVE_SPEAKER,
+                    "start_time": start,
+                    "end_time": end,
+                    "text": text,
+                    "segment_order": self.segment_order,
+                }
+            )
+            self.segment_order += 1
+        if not rows:
+            return
+        async with async_session() as db:
+            await insert_segments(db, rows)
+            await db.commit()
+        await response_cache.invalidate_meeting(self.meeting_id)
+        for row in rows:
+            await self._notify(
+                "transcript_segment",
+                segment_order=row["segment_order"],
+                start=row["start_time"],
+                end=row["end_time"],
+                text=row["text"],
+            )
+
+    async def _notify(self, event: str, **fields) -> None:
+        """Send to the streaming client (if still connected) and to progress listeners."""
+        try:
+            await self.send({"type": event, **fields})
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        await progress.publish(self.meeting_id, event, **fields)
+
+
+class FfmpegDecoder:
+    """Decodes a compressed stream (Opus in WebM/Ogg, ...) to 16 kHz mono PCM."""
+
+    def __init__(self, on_pcm):
+        self.on_pcm = on_pcm
+        self._proc: asyncio.subprocess.Process | None = None
+        self._reader: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        self._reader = asyncio.create_task(self._read())
+
+    async def write(self, data: bytes) -> None:
+        self._proc.stdin.write(data)
+        await self._proc.stdin.drain()
+
+    async def close(self) -> None:
+        self._proc.stdin.close()
+        await self._reader
+        await self._proc.wait()
+
+    async def _read(self) -> None:
+        while data := await self._proc.stdout.read(64 * 1024):
+            await self.on_pcm(data)
+
+
+async def handle_live_stream(websocket: WebSocket, meeting_id: int, audio_format: str) -> None:
+    """Run an accepted ingest WebSocket until the client stops or disconnects.
+
+    Binary messages carry audio; a text message ``{"type": "stop"}`` ends the
+    stream. The server sends ``transcript_partial`` / ``transcript_segment``
+    messages while it transcribes and ``finished`` once the pipeline is queued.
+    """
+    error = await begin_live_meeting(meeting_id)
+    if error:
+        await websocket.close(code=1008, reason=error)
+        return
+
+    session = LiveSession(meeting_id, websocket.send_json)
+    await session.start()
+    decoder = FfmpegDecoder(session.feed_pcm) if audio_format != "pcm" else None
+    connected = True
+    try:
+        if decoder:
+            await decoder.start()
+        feed = decoder.write if decoder else session.feed_pcm
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                connected = False
+                break
+            if message.get("bytes"):
+                await feed(message["bytes"])
+            elif message.get("text") and json.loads(message["text"]).get("type") == "stop":
+                break
+        if decoder:
+            await decoder.close()
+        await session.finish()
+    except Exception:
+        logger.exception("Live stream of meeting %d failed", meeting_id)
+        await session.abort()
+        if connected:
+            await websocket.close(code=1011)
+        return
+
+    if connected:
+        await websocket.send_json({"type": "finished", "meeting_id": meeting_id})
+        await websocket.close()
+
+
+async def begin_live_meeting(meeting_id: int) -> str | None:
+    """Mark the meeting as being processed; returns an error message if it cannot stream."""
+    async with async_session() as db:
+        # Locked so two connections cannot both claim the meeting.
+        meeting = await db.get(Meeting, meeting_id, with_for_update=True)
+        if meeting is None:
+            return "Toplantı bulunamadı"
+        if meeting.status != MeetingStatus.UPLOADING or meeting.audio_file_path:
+            return "Toplantının zaten bir ses kaydı var"
+        meeting.status = MeetingStatus.PROCESSING
+        meeting.processing_stage = None
+        await db.commit()
+    await run_in_threadpool(StageCheckpoints(meeting_id).clear)
+    await response_cache.invalidate_meeting(meeting_id)
+    await progress.clear(meeting_id)
+    return None
+
+
+async def _set_status(meeting_id: int, status: MeetingStatus) -> None:
+    async with async_session() as db:
+        meeting = await db.get(Meeting, meeting_id)
+        meeting.status = status
+        await db.commit()
+    await response_cache.invalidate_meeting(meeting_id)
+
+
+def _open_wav(path: Path) -> wave.Wave_write:
+    wav = wave.open(str(path), "wb")
+    wav.setnchannels(1)
+    wav.setsampwidth(2)
+    wav.setframerate(SAMPLE_RATE)
+    return wav
+
+
+def load_live_model():
+    """The live Whisper model from the registry; called at API startup to warm it."""
+    device, compute_type = get_device()
+    return registry.whisper(
+        _live_model(),
+        settings.whisper_language,
+        device,
+        compute_type,
+    )
+
+
+def _live_model() -> str:
+    return settings.live_whisper_model or settings.whisper_model
+
+
+def _transcribe_utterance(audio: np.ndarray) -> list[dict]:
+    model = load_live_model()
+    result = model.transcribe(audio, batch_size=1, language=settings.whisper_language)
+    return result["segments"]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Shared by all live sessions of this process so they queue for the model
+    # instead of oversubscribing the CPU.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.live_asr_workers, thread_name_prefix="live-asr"
+        )
+    return _executor
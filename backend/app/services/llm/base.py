@@ -1,21 +1,111 @@
+import asyncio
+import json
 from abc import ABC, abstractmethod
 
+import httpx
+
+from app.config import settings
+from app.services.llm.chunking import CHARS_PER_TOKEN, merge_tasks, split_transcript
+
+# Room left in the context window for instructions and the JSON skeleton.
+_PROMPT_TOKENS = 1024
+
+_SUMMARY_SYSTEM = (
+    "Sen bir toplantı asistanısın. Verilen toplantı transkriptini analiz et. "
+    "Yanıtını kesinlikle JSON formatında ver, başka bir şey yazma."
+)
+
+
+def http_pool_options() -> dict:
+    """Limits and timeouts for a provider's long-lived ``httpx.AsyncClient``."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.llm_max_connections,
+            max_keepalive_connections=settings.llm_max_keepalive_connections,
+            keepalive_expiry=settings.llm_keepalive_seconds,
+        ),
+        "timeout": httpx.Timeout(
+            settings.llm_timeout_seconds, connect=settings.llm_connect_timeout_seconds
+        ),
+    }
+
 
 class LLMProvider(ABC):
+    name: str = ""
+    model: str = ""
+    # Context window of the model in tokens. Transcripts that do not fit, or
+    # exceed settings.llm_chunk_tokens, are processed in chunks (map-reduce).
+    context_tokens: int = 8192
+    max_output_tokens: int = 4096
+
     @abstractmethod
     async def generate(self, prompt: str, system: str = "") -> str:
         """Generate a text response from the LLM."""
         ...
 
+    async def aclose(self) -> None:
+        """Release the provider's connection pool."""
+
+    def chunk_tokens(self) -> int:
+        """Largest transcript piece, in estimated tokens, sent in one prompt."""
+        fits = self.context_tokens - self.max_output_tokens - _PROMPT_TOKENS
+        return max(256, min(settings.llm_chunk_tokens, fits))
+
     async def summarize(self, transcript: str) -> dict:
         """Generate a meeting summary from a transcript.
 
         Returns dict with keys: full_summary, key_points, decisions
         """
-        system = (
-            "Sen bir toplantı asistanısın. Verilen toplantı transkriptini analiz et. "
-            "Yanıtını kesinlikle JSON formatında ver, başka bir şey yazma."
+        chunks = split_transcript(transcript, self.chunk_tokens())
+        if not chunks:
+            return _empty_summary()
+        if len(chunks) == 1:
+            return await self._summarize_chunk(transcript)
+
+        # Map: summarize the parts concurrently; reduce: merge the partial summaries.
+        partials = await self._map(self._summarize_chunk, chunks)
+        return await self._reduce_summaries(partials)
+
+    async def extract_tasks(self, transcript: str, participants: list[str]) -> list[dict]:
+        """Extract action items / tasks from a transcript.
+
+        Returns list of dicts with keys: title, description, assignee, priority
+        """
+        chunks = split_transcript(transcript, self.chunk_tokens())
+        if not chunks:
+            return []
+        if len(chunks) == 1:
+            return await self._extract_chunk_tasks(transcript, participants)
+
+        task_lists = await self._map(
+            lambda chunk: self._extract_chunk_tasks(chunk, participants), chunks
         )
+        return merge_tasks(task_lists)
+
+    async def analyze(self, transcript: str, participants: list[str]) -> tuple[dict, list[dict]]:
+        """Summary and tasks from one prompt per chunk, so the transcript is sent once.
+
+        Returns (summary, tasks) in the shapes of ``summarize`` and ``extract_tasks``.
+        """
+        chunks = split_transcript(transcript, self.chunk_tokens())
+        if not chunks:
+            return _empty_summary(), []
+        results = await self._map(lambda chunk: self._analyze_chunk(chunk, participants), chunks)
+        if len(results) == 1:
+            return results[0]
+        summary = await self._reduce_summaries([summary for summary, _ in results])
+        return summary, merge_tasks([tasks for _, tasks in results])
+
+    async def _map(self, call, items: list) -> list:
+        semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+
+        async def bounded(item):
+            async with semaphore:
+                return await call(item)
+
+        return await asyncio.gather(*(bounded(item) for item in items))
+
+    async def _summarize_chunk(self, transcript: str) -> dict:
         prompt = f"""Aşağıdaki toplantı transkriptini analiz et ve JSON formatında yanıt ver:
 
 {{
@@ -26,28 +116,46 @@ class LLMProvider(ABC):
 
 TRANSKRİPT:
 {transcript}"""
-        response = await self.generate(prompt, system)
-        import json
+        response = await self.generate(prompt, _SUMMARY_SYSTEM)
+        return _parse_summary(response)
 
-        # Try to parse JSON from the response
-        try:
-            # Handle potential markdown code blocks
-            text = response.strip()
-            if text.startswith("```"):
-                text = text.split("\n", 1)[1].rsplit("```", 1)[0]
-            return json.loads(text)
-        except json.JSONDecodeError:
-            return {
-                "full_summary": response,
-                "key_points": [],
-                "decisions": [],
-            }
+    async def _reduce_summaries(self, partials: list[dict], condensed: bool = False) -> dict:
+        """Merge partial summaries, in rounds if they do not fit in one prompt."""
+        max_chars = self.chunk_tokens() * CHARS_PER_TOKEN
+        # Each partial must fit a prompt on its own, so no group cuts one apart.
+        parts = [_dump_summary(p, max_chars) for p in partials]
+        groups = split_transcript("\n".join(parts), self.chunk_tokens())
+        if len(groups) == 1:
+            return await self._merge_summaries(groups[0])
+        if len(groups) < len(parts):
+            merged = await self._map(self._merge_summaries, groups)
+            return await self._reduce_summaries(merged)
+        if not condensed:
+            # Partials this long leave no room for a second one in a prompt:
+            # condense each on its own and try again.
+            shorter = await self._map(self._merge_summaries, parts)
+            return await self._reduce_summaries(shorter, condensed=True)
+        # Still too long to pair up: shorten each to an equal share of one prompt.
+        share = max_chars // len(partials) - 1
+        return await self._merge_summaries("\n".join(_dump_summary(p, share) for p in partials))
 
-    async def extract_tasks(self, transcript: str, participants: list[str]) -> list[dict]:
-        """Extract action items / tasks from a transcript.
+    async def _merge_summaries(self, partials: str) -> dict:
+        prompt = f"""Aşağıda aynı toplantının ardışık bölümlerine ait özetler JSON olarak,
+sırayla verilmiştir. Bunları tek bir toplantı özetinde birleştir. Tekrar eden
+önemli noktaları ve kararları bir kez yaz. JSON formatında yanıt ver:
 
-        Returns list of dicts with keys: title, description, assignee, priority
-        """
+{{
+    "full_summary": "Toplantının kapsamlı özeti (2-3 paragraf)",
+    "key_points": ["Önemli nokta 1", "Önemli nokta 2", ...],
+    "decisions": ["Alınan karar 1", "Alınan karar 2", ...]
+}}
+
+BÖLÜM ÖZETLERİ:
+{partials}"""
+        response = await self.generate(prompt, _SUMMARY_SYSTEM)
+        return _parse_summary(response)
+
+    async def _extract_chunk_tasks(self, transcript: str, participants: list[str]) -> list[dict]:
         participants_str = ", ".join(participants) if participants else "Belirtilmemiş"
         system = (
             "Sen bir toplantı asistanısın. Verilen toplantı transkriptinden görevleri çıkar. "
@@ -69,12 +177,92 @@ Her görev için JSON formatında yanıt ver:
 TRANSKRİPT:
 {transcript}"""
         response = await self.generate(prompt, system)
-        import json
-
         try:
-            text = response.strip()
-            if text.startswith("```"):
-                text = text.split("\n", 1)[1].rsplit("```", 1)[0]
-            return json.loads(text)
+            tasks = _parse_json(response)
         except json.JSONDecodeError:
             return []
+        return tasks if isinstance(tasks, list) else []
+
+    async def _analyze_chunk(
+        self, transcript: str, participants: list[str]
+    ) -> tuple[dict, list[dict]]:
+        participants_str = ", ".join(participants) if participants else "Belirtilmemiş"
+        prompt = f"""Aşağıdaki toplantı transkriptini analiz et: özetini çıkar ve aksiyon
+maddelerini (görevleri) belirle.
+Katılımcılar: {participants_str}
+
+JSON formatında yanıt ver:
+{{
+    "summary": {{
+        "full_summary": "Toplantının kapsamlı özeti (2-3 paragraf)",
+        "key_points": ["Önemli nokta 1", "Önemli nokta 2", ...],
+        "decisions": ["Alınan karar 1", "Alınan karar 2", ...]
+    }},
+    "tasks": [
+        {{
+            "title": "Görev başlığı",
+            "description": "Görev açıklaması",
+            "assignee": "Sorumlu kişinin adı veya null",
+            "priority": "low|medium|high"
+        }}
+    ]
+}}
+
+TRANSKRİPT:
+{transcript}"""
+        response = await self.generate(prompt, _SUMMARY_SYSTEM)
+        try:
+            data = _parse_json(response)
+        except json.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict) or not isinstance(data.get("summary"), dict):
+            return {"full_summary": response, "key_points": [], "decisions": []}, []
+        tasks = data.get("tasks")
+        return data["summary"], tasks if isinstance(tasks, list) else []
+
+
+def _empty_summary() -> dict:
+    return {"full_summary": "", "key_points": [], "decisions": []}
+
+
+def _dump_summary(summary: dict, max_chars: int) -> str:
+    """``summary`` as JSON of at most ``max_chars``, shortened whole fields first.
+
+    Extra keys are dropped, then key points and decisions from the end, then
+    the tail of the summary text, so the result is always valid JSON.
+    """
+    text = json.dumps(summary, ensure_ascii=False)
+    if len(text) <= max_chars:
+        return text
+    short = {"full_summary": str(summary.get("full_summary") or "")}
+    for key in ("key_points", "decisions"):
+        value = summary.get(key)
+        short[key] = list(value) if isinstance(value, list) else []
+        while short[key] and len(json.dumps(short, ensure_ascii=False)) > max_chars:
+            short[key].pop()
+    text, short["full_summary"] = short["full_summary"], ""
+    room = max_chars - len(json.dumps(short, ensure_ascii=False))
+    short["full_summary"] = text[: max(0, room)]
+    # Escaped characters take more than one; trim what they add.
+    while short["full_summary"] and len(json.dumps(short, ensure_ascii=False)) > max_chars:
+        excess = len(json.dumps(short, ensure_ascii=False)) - max_chars
+        short["full_summary"] = short["full_summary"][:-excess]
+    return json.dumps(short, ensure_ascii=False)
+
+
+def _parse_json(response: str):
+    # Handle potential markdown code blocks
+    text = response.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1].rsplit("```", 1)[0]
+    return json.loads(text)
+
+
+def _parse_summary(response: str) -> dict:
+    try:
+        summary = _parse_json(response)
+    except json.JSONDecodeError:
+        summary = None
+    if not isinstance(summary, dict):
+        return {"full_summary": response, "key_points": [], "decisions": []}
+    return summary
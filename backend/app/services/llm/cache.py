@@ -0,0 +1,196 @@
+"""Redis cache of LLM responses keyed by provider, model, system prompt and prompt.
+
+Regenerating a summary, rebuilding a report or retrying a pipeline stage
+resends byte-identical prompts; ``CachedLLMProvider`` answers those from
+Redis instead of the model. Entries expire after ``llm_cache_ttl_seconds``
+and the oldest ones are evicted once the cache holds more than
+``llm_cache_max_mb``. Hit/miss counters and the tokens that hits saved are
+kept in Redis so they add up across API and worker processes. Redis errors
+never fail a call; it then goes to the model as if caching were off.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import redis.asyncio as redis
+
+from app.config import settings
+from app.services.llm import usage
+from app.services.llm.base import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+_PREFIX = "ma:llm"
+_INDEX = f"{_PREFIX}:index"  # zset: entry key -> stored at (unix time)
+_SIZES = f"{_PREFIX}:sizes"  # hash: entry key -> bytes
+_BYTES = f"{_PREFIX}:bytes"
+_STATS = f"{_PREFIX}:stats"
+
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+_client: redis.Redis | None = None
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.from_url(settings.llm_cache_url or settings.redis_url)
+    return _client
+
+
+@contextmanager
+def bypass():
+    """Send every LLM call in this block to the model and refresh the cache with the answer."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _key(provider: LLMProvider, system: str, prompt: str) -> str:
+    digest = hashlib.sha256()
+    for part in (system, prompt, str(provider.max_output_tokens)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return f"{_PREFIX}:{provider.name}:{provider.model}:{digest.hexdigest()}"
+
+
+class CachedLLMProvider(LLMProvider):
+    """Wraps a provider so ``generate`` is served from the cache when possible.
+
+    ``summarize``, ``extract_tasks`` and ``analyze`` run on the wrapper, so
+    every prompt they send goes through the cache.
+    """
+
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        self.name = provider.name
+        self.model = provider.model
+        self.context_tokens = provider.context_tokens
+        self.max_output_tokens = provider.max_output_tokens
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+
+    async def generate(self, prompt: str, system: str = "", use_cache: bool = True) -> str:
+        key = _key(self.provider, system, prompt)
+        if use_cache and not _bypass.get():
+            entry = await _get(key)
+            if entry is not None:
+                return entry["text"]
+        else:
+            await _count(bypass=1)
+
+        with usage.track_usage() as call:
+            text = await self.provider.generate(prompt, system)
+        # Pass the call's usage on to whoever is tracking this block of work.
+        usage.record(call.input_tokens, call.output_tokens)
+        await _put(key, text, call.input_tokens, call.output_tokens)
+        return text
+
+
+async def _get(key: str) -> dict | None:
+    try:
+        raw = await _redis().get(key)
+        if raw is None:
+            await _count(misses=1)
+            return None
+        entry = json.loads(raw)
+        await _count(
+            hits=1,
+            saved_input_tokens=entry["input_tokens"],
+            saved_output_tokens=entry["output_tokens"],
+        )
+        return entry
+    except redis.RedisError:
+        logger.warning("LLM cache unavailable", exc_info=True)
+        return None
+
+
+async def _put(key: str, text: str, input_tokens: int, output_tokens: int) -> None:
+    raw = json.dumps(
+        {"text": text, "input_tokens": input_tokens, "output_tokens": output_tokens},
+        ensure_ascii=False,
+    ).encode()
+    try:
+        async with _redis().pipeline(transaction=True) as pipe:
+            pipe.set(key, raw, ex=settings.llm_cache_ttl_seconds)
+            pipe.zadd(_INDEX, {key: time.time()})
+            pipe.hget(_SIZES, key)
+            pipe.hset(_SIZES, key, len(raw))
+            pipe.incrby(_BYTES, len(raw))
+            *_, previous, _, total = await pipe.execute()
+        if previous is not None:  # overwritten entry, e.g. after a bypass
+            total = await _redis().decrby(_BYTES, int(previous))
+        if total > settings.llm_cache_max_mb * 1024 * 1024:
+            await _evict()
+    except redis.RedisError:
+        logger.warning("LLM cache unavailable", exc_info=True)
+
+
+async def _evict() -> None:
+    """Drop expired index entries, then the oldest entries until under the size limit."""
+    client = _redis()
+    budget = settings.llm_cache_max_mb * 1024 * 1024
+    expired = await client.zrangebyscore(_INDEX, "-inf", time.time() - settings.llm_cache_ttl_seconds)
+    await _drop(expired)
+    while int(await client.get(_BYTES) or 0) > budget:
+        oldest = [key for key, _ in await client.zpopmin(_INDEX, 100)]
+        if not oldest:
+            break
+        await _drop(oldest, indexed=False)
+        await _count(evictions=len(oldest))
+
+
+async def _drop(keys: list, indexed: bool = True) -> None:
+    if not keys:
+        return
+    client = _redis()
+    sizes = await client.hmget(_SIZES, keys)
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.delete(*keys)
+        pipe.hdel(_SIZES, *keys)
+        if indexed:
+            pipe.zrem(_INDEX, *keys)
+        pipe.decrby(_BYTES, sum(int(size or 0) for size in sizes))
+        await pipe.execute()
+
+
+async def _count(**counters: int) -> None:
+    try:
+        async with _redis().pipeline(transaction=False) as pipe:
+            for name, amount in counters.items():
+                pipe.hincrby(_STATS, name, amount)
+            await pipe.execute()
+    except redis.RedisError:
+        logger.warning("LLM cache unavailable", exc_info=True)
+
+
+async def stats() -> dict:
+    """Counters across all processes, with the hit rate and current size."""
+    try:
+        counters = {k.decode(): int(v) for k, v in (await _redis().hgetall(_STATS)).items()}
+        size = int(await _redis().get(_BYTES) or 0)
+        entries = await _redis().zcard(_INDEX)
+    except redis.RedisError:
+        logger.warning("LLM cache unavailable", exc_info=True)
+        return {"available": False}
+    lookups = counters.get("hits", 0) + counters.get("misses", 0)
+    return {
+        "available": True,
+        "entries": entries,
+        "size_mb": round(size / (1024 * 1024), 2),
+        "hit_rate": round(counters.get("hits", 0) / lookups, 3) if lookups else None,
+        **counters,
+    }
+
+
+async def close() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
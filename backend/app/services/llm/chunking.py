@@ -0,0 +1,102 @@
+"""Token-budgeted splitting of transcripts and merging of per-chunk task lists."""
+
+import re
+from difflib import SequenceMatcher
+
+# Conservative for Turkish with BPE tokenizers, which average close to three
+# characters per token; overestimating only makes chunks a little smaller.
+CHARS_PER_TOKEN = 3
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_transcript(transcript: str, max_tokens: int) -> list[str]:
+    """Split ``transcript`` into chunks of at most ``max_tokens`` (estimated).
+
+    Chunks end on speaker-turn boundaries (one turn per line). A single turn
+    longer than the budget is split between sentences and each part keeps the
+    turn's ``[SPEAKER]:`` prefix.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for turn in transcript.splitlines():
+        for part in _split_turn(turn, max_chars) if len(turn) > max_chars else [turn]:
+            if current and size + len(part) + 1 > max_chars:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.append(part)
+            size += len(part) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _split_turn(turn: str, max_chars: int) -> list[str]:
+    speaker, sep, text = turn.partition(": ")
+    prefix = speaker + sep if sep and speaker.startswith("[") else ""
+    if not prefix:
+        text = turn
+    budget = max(1, max_chars - len(prefix))
+
+    parts: list[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        # Sentences longer than the budget are cut where they must be.
+        while len(sentence) > budget:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(sentence[:budget])
+            sentence = sentence[budget:]
+        if current and len(current) + 1 + len(sentence) > budget:
+            parts.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        parts.append(current)
+    return [prefix + part for part in parts]
+
+
+def _normalize_title(title: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", title.casefold()).split())
+
+
+def merge_tasks(task_lists: list[list[dict]], similarity: float = 0.85) -> list[dict]:
+    """Concatenate per-chunk task lists, folding tasks with near-identical titles.
+
+    The first occurrence is kept; duplicates fill in a missing assignee or
+    description and raise the priority to the highest one seen.
+    """
+    merged: list[dict] = []
+    keys: list[str] = []
+    for tasks in task_lists:
+        for task in tasks:
+            if not isinstance(task, dict) or not task.get("title"):
+                continue
+            key = _normalize_title(str(task["title"]))
+            for i, seen in enumerate(keys):
+                if key == seen or SequenceMatcher(None, key, seen).ratio() >= similarity:
+                    _fold(merged[i], task)
+                    break
+            else:
+                merged.append(dict(task))
+                keys.append(key)
+    return merged
+
+
+def _fold(kept: dict, duplicate: dict) -> None:
+    if not kept.get("assignee") and duplicate.get("assignee"):
+        kept["assignee"] = duplicate["assignee"]
+    if len(duplicate.get("description") or "") > len(kept.get("description") or ""):
+        kept["description"] = duplicate["description"]
+    rank = _PRIORITY_RANK.get(str(duplicate.get("priority")).lower(), -1)
+    if rank > _PRIORITY_RANK.get(str(kept.get("priority")).lower(), -1):
+        kept["priority"] = duplicate["priority"]
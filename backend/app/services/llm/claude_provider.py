@@ -1,18 +1,32 @@
 import anthropic
 
 from app.config import settings
-from app.services.llm.base import LLMProvider
+from app.services.llm import usage
+from app.services.llm.base import LLMProvider, http_pool_options
 
 
 class ClaudeProvider(LLMProvider):
+    name = "claude"
+    model = "claude-sonnet-4-20250514"
+    context_tokens = 200_000
+
     def __init__(self):
-        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self.client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(**http_pool_options()),
+            # Retries are done by GovernedLLMProvider, which also respects shared limits.
+            max_retries=0,
+        )
 
     async def generate(self, prompt: str, system: str = "") -> str:
         message = await self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
+            model=self.model,
+            max_tokens=self.max_output_tokens,
             system=system or "Sen yardımcı bir asistansın.",
             messages=[{"role": "user", "content": prompt}],
         )
+        usage.record(message.usage.input_tokens, message.usage.output_tokens)
         return message.content[0].text
+
+    async def aclose(self) -> None:
+        await self.client.close()
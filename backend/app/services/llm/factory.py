@@ -1,6 +1,20 @@
+"""Process-wide LLM provider instances.
+
+Each provider is built once per process and keeps its HTTP connection pool
+for the process lifetime, so calls reuse warm keep-alive connections instead
+of paying TCP and TLS setup. The clients belong to the process's event loop
+(the API's loop, or the worker runtime loop). ``close_llm_providers``
+releases the pools; the API lifespan and the worker runtime call it on
+shutdown.
+"""
+
+import threading
+
 from app.config import settings
+from app.services.llm import governor
 from app.services.llm.base import LLMProvider
 from app.services.llm.claude_provider import ClaudeProvider
+from app.services.llm.governor import GovernedLLMProvider
 from app.services.llm.ollama_provider import OllamaProvider
 from app.services.llm.openai_provider import OpenAIProvider
 
@@ -10,13 +24,38 @@ _PROVIDERS: dict[str, type[LLMProvider]] = {
     "ollama": OllamaProvider,
 }
 
+_instances: dict[str, LLMProvider] = {}
+_lock = threading.Lock()
+
 
 def get_llm_provider(provider_name: str | None = None) -> LLMProvider:
     name = provider_name or settings.llm_provider
+    provider = _instances.get(name)
+    if provider is not None:
+        return provider
+
     provider_class = _PROVIDERS.get(name)
     if not provider_class:
         raise ValueError(
             f"Bilinmeyen LLM provider: {name}. "
             f"Desteklenen: {', '.join(_PROVIDERS.keys())}"
         )
-    return provider_class()
+    with _lock:
+        if name not in _instances:
+            # Cache hits must not use up the rate budget, so the cache is outermost.
+            provider = GovernedLLMProvider(provider_class())
+            if settings.llm_cache_enabled:
+                from app.services.llm.cache import CachedLLMProvider
+
+                provider = CachedLLMProvider(provider)
+            _instances[name] = provider
+        return _instances[name]
+
+
+async def close_llm_providers() -> None:
+    with _lock:
+        providers = list(_instances.values())
+        _instances.clear()
+    for provider in providers:
+        await provider.aclose()
+    await governor.close()
@@ -0,0 +1,313 @@
+"""Rate limiting of LLM calls shared by every API and worker process.
+
+Each provider (and model) gets two token buckets in Redis, one for requests
+and one for tokens per minute, plus a semaphore bounding the calls in flight.
+Buckets are refilled and drawn from atomically in Lua with the Redis clock,
+so all workers see the same budget. A call is charged its estimated prompt
+tokens up front and the difference to the reported usage afterwards; a failed
+attempt is refunded.
+
+``GovernedLLMProvider`` wraps a provider: every ``generate`` waits for the
+budget and retries 429, 5xx and connection errors with jittered exponential
+backoff. A 429 also pauses the whole provider for its ``Retry-After``, so the
+other workers do not run into the same limit. Redis errors never block a
+call; it then runs unthrottled. A provider without limits skips Redis altogether.
+
+Limits come from ``settings.llm_rate_limits``, keyed by provider name, e.g.
+``{"claude": {"requests_per_minute": 50, "tokens_per_minute": 40000,
+"max_in_flight": 8}}``; a missing or zero limit is not enforced.
+"""
+
+import asyncio
+import logging
+import random
+import uuid
+from contextlib import asynccontextmanager
+
+import anthropic
+import httpx
+import openai
+import redis.asyncio as redis
+
+from app.config import settings
+from app.services.llm import usage
+from app.services.llm.base import LLMProvider
+from app.services.llm.chunking import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+_PREFIX = "ma:llm-governor"
+_RETRY_STATUS = {408, 409, 429}
+_CONNECTION_ERRORS = (
+    httpx.TransportError,
+    anthropic.APIConnectionError,
+    openai.APIConnectionError,
+)
+_POLL_SECONDS = 0.05
+
+# KEYS: request bucket, token bucket, cooldown. ARGV: rpm, tpm, cost.
+# Returns "0" when both buckets had room (and were drawn from), else the wait in seconds.
+_ACQUIRE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local cooldown = tonumber(redis.call('GET', KEYS[3]) or '0')
+if cooldown > now then return tostring(cooldown - now) end
+
+local function level(key, per_minute)
+  local b = redis.call('HMGET', key, 'level', 'ts')
+  local lvl = tonumber(b[1]) or per_minute
+  local ts = tonumber(b[2]) or now
+  return math.min(per_minute, lvl + (now - ts) * per_minute / 60)
+end
+
+local rpm, tpm = tonumber(ARGV[1]), tonumber(ARGV[2])
+-- A prompt larger than the whole minute's budget waits for a full bucket.
+local cost = math.min(tonumber(ARGV[3]), tpm)
+local wait, requests, tokens = 0, 0, 0
+if rpm > 0 then
+  requests = level(KEYS[1], rpm)
+  if requests < 1 then wait = math.max(wait, (1 - requests) * 60 / rpm) end
+end
+if tpm > 0 then
+  tokens = level(KEYS[2], tpm)
+  if tokens < cost then wait = math.max(wait, (cost - tokens) * 60 / tpm) end
+end
+if wait > 0 then return tostring(wait) end
+if rpm > 0 then
+  redis.call('HSET', KEYS[1], 'level', requests - 1, 'ts', now)
+  redis.call('EXPIRE', KEYS[1], 120)
+end
+if tpm > 0 then
+  redis.call('HSET', KEYS[2], 'level', tokens - cost, 'ts', now)
+  redis.call('EXPIRE', KEYS[2], 120)
+end
+return '0'
+"""
+
+# KEYS: token bucket. ARGV: tpm, tokens to charge (negative refunds).
+_CHARGE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tpm = tonumber(ARGV[1])
+local b = redis.call('HMGET', KEYS[1], 'level', 'ts')
+local lvl = tonumber(b[1]) or tpm
+local ts = tonumber(b[2]) or now
+lvl = math.min(tpm, lvl + (now - ts) * tpm / 60 - tonumber(ARGV[2]))
+redis.call('HSET', KEYS[1], 'level', lvl, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 120)
+return 1
+"""
+
+# KEYS: cooldown. ARGV: seconds. Extends, never shortens, the pause.
+_COOLDOWN = """
+local t = redis.call('TIME')
+local until_ = tonumber(t[1]) + tonumber(t[2]) / 1000000 + tonumber(ARGV[1])
+if until_ > tonumber(redis.call('GET', KEYS[1]) or '0') then
+  local ms = math.max(1, math.ceil(tonumber(ARGV[1]) * 1000))
+  redis.call('SET', KEYS[1], tostring(until_), 'PX', ms)
+end
+return 1
+"""
+
+# KEYS: lease zset. ARGV: limit, lease id, lease seconds.
+# Leases of callers that died without releasing expire and are dropped.
+_LEASE = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+  redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[2])
+  redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[3])))
+  return 1
+end
+return 0
+"""
+
+_client: redis.Redis | None = None
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.from_url(settings.redis_url)
+    return _client
+
+
+class LLMGovernor:
+    """Shared request, token and concurrency budget of one provider and model."""
+
+    def __init__(self, provider: str, model: str):
+        limits = settings.llm_rate_limits.get(provider, {})
+        self.requests_per_minute = limits.get("requests_per_minute", 0)
+        self.tokens_per_minute = limits.get("tokens_per_minute", 0)
+        self.max_in_flight = limits.get("max_in_flight", 0)
+        prefix = f"{_PREFIX}:{provider}:{model}"
+        self._keys = [f"{prefix}:requests", f"{prefix}:tokens", f"{prefix}:cooldown"]
+        self._leases = f"{prefix}:in_flight"
+
+    @property
+    def enabled(self) -> bool:
+        """False without limits; calls then never touch Redis."""
+        return bool(self.requests_per_minute or self.tokens_per_minute or self.max_in_flight)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int):
+        """Wait for the rate budget and an in-flight slot, held for the block."""
+        if not self.enabled:
+            yield
+            return
+        await self._acquire_rate(estimated_tokens)
+        lease = await self._acquire_lease()
+        try:
+            yield
+        finally:
+            if lease is not None:
+                try:
+                    await _redis().zrem(self._leases, lease)
+                except redis.RedisError:
+                    logger.warning("LLM governor unavailable", exc_info=True)
+
+    async def charge(self, tokens: int) -> None:
+        """Correct the token bucket by the difference between used and estimated tokens."""
+        if not self.tokens_per_minute or not tokens:
+            return
+        try:
+            await _redis().eval(_CHARGE, 1, self._keys[1], self.tokens_per_minute, tokens)
+        except redis.RedisError:
+            logger.warning("LLM governor unavailable", exc_info=True)
+
+    async def cooldown(self, seconds: float) -> None:
+        """Pause every caller of this provider, e.g. after a 429."""
+        if not self.enabled:
+            return
+        try:
+            await _redis().eval(_COOLDOWN, 1, self._keys[2], seconds)
+        except redis.RedisError:
+            logger.warning("LLM governor unavailable", exc_info=True)
+
+    async def _acquire_rate(self, estimated_tokens: int) -> None:
+        waited = 0.0
+        while True:
+            try:
+                wait = float(
+                    await _redis().eval(
+                        _ACQUIRE,
+                        3,
+                        *self._keys,
+                        self.requests_per_minute,
+                        self.tokens_per_minute,
+                        estimated_tokens,
+                    )
+                )
+            except redis.RedisError:
+                logger.warning("LLM governor unavailable", exc_info=True)
+                return
+            if wait <= 0:
+                if waited >= 1:
+                    logger.info("Waited %.1fs for the %s rate budget", waited, self._keys[0])
+                return
+            # Jitter keeps waiting workers from retrying in lockstep.
+            delay = wait + random.uniform(0, _POLL_SECONDS * 4)
+            await asyncio.sleep(delay)
+            waited += delay
+
+    async def _acquire_lease(self) -> str | None:
+        if not self.max_in_flight:
+            return None
+        lease = uuid.uuid4().hex
+        lease_seconds = settings.llm_timeout_seconds + 30
+        while True:
+            try:
+                acquired = await _redis().eval(
+                    _LEASE, 1, self._leases, self.max_in_flight, lease, lease_seconds
+                )
+                if acquired:
+                    return lease
+            except redis.RedisError:
+                logger.warning("LLM governor unavailable", exc_info=True)
+                return None
+            await asyncio.sleep(random.uniform(_POLL_SECONDS, _POLL_SECONDS * 4))
+
+
+def _status_code(exc: Exception) -> int | None:
+    status = getattr(exc, "status_code", None)
+    if status is None and isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    return status
+
+
+def _retry_after(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:  # HTTP-date form; fall back to backoff
+        return None
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, _CONNECTION_ERRORS):
+        return True
+    status = _status_code(exc)
+    return status is not None and (status in _RETRY_STATUS or status >= 500)
+
+
+class GovernedLLMProvider(LLMProvider):
+    """Wraps a provider so each ``generate`` is rate limited and retried with backoff."""
+
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        self.name = provider.name
+        self.model = provider.model
+        self.context_tokens = provider.context_tokens
+        self.max_output_tokens = provider.max_output_tokens
+        self.governor = LLMGovernor(provider.name, provider.model)
+
+    async def aclose(self) -> None:
+        await self.provider.aclose()
+
+    async def generate(self, prompt: str, system: str = "") -> str:
+        estimate = estimate_tokens(system) + estimate_tokens(prompt)
+        attempt = 0
+        while True:
+            async with self.governor.slot(estimate):
+                try:
+                    with usage.track_usage() as call:
+                        text = await self.provider.generate(prompt, system)
+                    error = None
+                except Exception as exc:
+                    error = exc
+
+            if error is None:
+                usage.record(call.input_tokens, call.output_tokens)
+                await self.governor.charge(call.input_tokens + call.output_tokens - estimate)
+                return text
+            # A failed attempt is not billed, so its estimate goes back to the bucket
+            # instead of being charged again by the retry.
+            await self.governor.charge(-estimate)
+            if attempt >= settings.llm_max_retries or not _retryable(error):
+                raise error
+
+            # Full jitter: a random delay up to the exponential cap, unless told otherwise.
+            retry_after = _retry_after(error)
+            cap = settings.llm_backoff_base_seconds * 2**attempt
+            delay = retry_after or random.uniform(0, min(settings.llm_backoff_max_seconds, cap))
+            if _status_code(error) == 429:
+                await self.governor.cooldown(delay)
+            attempt += 1
+            logger.warning(
+                "%s call failed (%s), retry %d/%d in %.1fs",
+                self.name,
+                _status_code(error) or type(error).__name__,
+                attempt,
+                settings.llm_max_retries,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+
+async def close() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
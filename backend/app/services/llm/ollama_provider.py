@@ -1,24 +1,35 @@
 import httpx
 
 from app.config import settings
-from app.services.llm.base import LLMProvider
+from app.services.llm import usage
+from app.services.llm.base import LLMProvider, http_pool_options
 
 
 class OllamaProvider(LLMProvider):
+    name = "ollama"
+
     def __init__(self):
         self.base_url = settings.ollama_base_url
         self.model = settings.ollama_model
+        self.context_tokens = settings.ollama_num_ctx
+        self.client = httpx.AsyncClient(base_url=self.base_url, **http_pool_options())
 
     async def generate(self, prompt: str, system: str = "") -> str:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "system": system,
-                    "stream": False,
-                },
-            )
-            response.raise_for_status()
-            return response.json()["response"]
+        response = await self.client.post(
+            "/api/generate",
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "system": system,
+                "stream": False,
+                # Ollama truncates prompts to its own default window otherwise.
+                "options": {"num_ctx": self.context_tokens},
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        usage.record(data.get("prompt_eval_count"), data.get("eval_count"))
+        return data["response"]
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
@@ -1,12 +1,22 @@
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from app.config import settings
-from app.services.llm.base import LLMProvider
+from app.services.llm import usage
+from app.services.llm.base import LLMProvider, http_pool_options
 
 
 class OpenAIProvider(LLMProvider):
+    name = "openai"
+    model = "gpt-4o"
+    context_tokens = 128_000
+
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=DefaultAsyncHttpxClient(**http_pool_options()),
+            # Retries are done by GovernedLLMProvider, which also respects shared limits.
+            max_retries=0,
+        )
 
     async def generate(self, prompt: str, system: str = "") -> str:
         messages = []
@@ -15,8 +25,13 @@ class OpenAIProvider(LLMProvider):
         messages.append({"role": "user", "content": prompt})
 
         response = await self.client.chat.completions.create(
-            model="gpt-4o",
+            model=self.model,
             messages=messages,
-            max_tokens=4096,
+            max_tokens=self.max_output_tokens,
         )
+        if response.usage is not None:
+            usage.record(response.usage.prompt_tokens, response.usage.completion_tokens)
         return response.choices[0].message.content or ""
+
+    async def aclose(self) -> None:
+        await self.client.close()
@@ -0,0 +1,39 @@
+"""Token usage of LLM calls, accumulated per tracked block of work.
+
+Providers call ``record`` after every request. ``track_usage`` installs a
+fresh counter in a context variable, so concurrent meetings on the same
+event loop are counted apart while ``asyncio.gather`` children of one
+meeting add to the same counter.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass
+class Usage:
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+_current: ContextVar[Usage | None] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_usage():
+    usage = Usage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+
+
+def record(input_tokens: int | None, output_tokens: int | None) -> None:
+    usage = _current.get()
+    if usage is not None:
+        usage.calls += 1
+        usage.input_tokens += input_tokens or 0
+        usage.output_tokens += output_tokens or 0
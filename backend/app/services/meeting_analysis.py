@@ -0,0 +1,66 @@
+"""LLM analysis of a meeting transcript: summary and tasks in one pipeline stage.
+
+In ``parallel`` mode the summary and task prompts are sent concurrently. In
+``combined`` mode one prompt per transcript chunk returns both, so the
+transcript's input tokens are paid once. Each run's latency and token usage
+is returned as an ``AnalysisRun`` for the caller to store; so is that of a
+summary-only run, used when a refined transcript replaces a draft.
+"""
+
+import asyncio
+import time
+
+from app.config import settings
+from app.models.analysis_run import AnalysisRun
+from app.services.llm.factory import get_llm_provider
+from app.services.llm.usage import track_usage
+
+MODES = ("parallel", "combined")
+
+
+async def analyze_transcript(
+    meeting_id: int,
+    transcript_text: str,
+    participant_names: list[str],
+    mode: str | None = None,
+) -> tuple[dict, list[dict], AnalysisRun]:
+    """Return (summary, tasks, run) for a transcript."""
+    mode = mode or settings.llm_analysis_mode
+    if mode not in MODES:
+        raise ValueError(f"Bilinmeyen analiz modu: {mode}. Desteklenen: {', '.join(MODES)}")
+
+    llm = get_llm_provider()
+    started = time.perf_counter()
+    with track_usage() as usage:
+        if mode == "combined":
+            summary, tasks = await llm.analyze(transcript_text, participant_names)
+        else:
+            summary, tasks = await asyncio.gather(
+                llm.summarize(transcript_text),
+                llm.extract_tasks(transcript_text, participant_names),
+            )
+    return summary, tasks, _run(meeting_id, llm, mode, started, usage)
+
+
+async def summarize_transcript(
+    meeting_id: int, transcript_text: str
+) -> tuple[dict, AnalysisRun]:
+    """Return (summary, run) for a transcript whose tasks are kept."""
+    llm = get_llm_provider()
+    started = time.perf_counter()
+    with track_usage() as usage:
+        summary = await llm.summarize(transcript_text)
+    return summary, _run(meeting_id, llm, "summary", started, usage)
+
+
+def _run(meeting_id: int, llm, mode: str, started: float, usage) -> AnalysisRun:
+    return AnalysisRun(
+        meeting_id=meeting_id,
+        provider=llm.name,
+        model=llm.model,
+        mode=mode,
+        latency_seconds=round(time.perf_counter() - started, 3),
+        llm_calls=usage.calls,
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+    )
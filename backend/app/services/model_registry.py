@@ -0,0 +1,284 @@
+"""Process-wide cache for WhisperX models (ASR, alignment, diarization).
+
+Loading ``large-v3`` and the pyannote pipeline takes tens of seconds, so a
+worker process keeps the models it has loaded and hands them out to every
+job. Models are evicted least-recently-used once the estimated memory budget
+(``settings.model_cache_budget_mb``) would be exceeded. The process pool of
+chunked transcription is charged as well, one Whisper model per process.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough resident sizes in MB, used for budget accounting only.
+_WHISPER_SIZES_MB = {
+    "tiny": 150,
+    "base": 300,
+    "small": 700,
+    "medium": 1800,
+    "large-v2": 3500,
+    "large-v3": 3500,
+}
+_ALIGN_SIZE_MB = 1200
+_DIARIZATION_SIZE_MB = 600
+
+# (kind, name, language, device, compute_type, threads)
+ModelKey = tuple[str, str, str | None, str, str | None, int | None]
+
+
+@dataclass
+class _Entry:
+    model: Any
+    size_mb: int
+    load_seconds: float
+    close: Callable[[Any], None] | None = None
+
+
+@dataclass
+class RegistryStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    load_seconds: dict[str, float] = field(default_factory=dict)
+
+
+def get_device() -> tuple[str, str]:
+    """Return (device, compute_type) for the current host, or for ``settings.device``."""
+    device = settings.device or ("cuda" if _cuda_available() else "cpu")
+    compute_type = "float16" if device == "cuda" else "int8"
+    return device, compute_type
+
+
+def cpu_allocation() -> tuple[int, int]:
+    """Return (asr_threads, diarization_threads).
+
+    With parallel diarization the cores are split between the two stages,
+    otherwise each stage may use all of them in turn.
+    """
+    cores = os.cpu_count() or 1
+    if not settings.parallel_diarization:
+        return settings.asr_threads or cores, settings.diarization_threads or cores
+    diarization = settings.diarization_threads or max(1, cores // 3)
+    asr = settings.asr_threads or max(1, cores - diarization)
+    return asr, diarization
+
+
+_torch_threads: int | None = None
+
+
+def configure_torch_threads() -> None:
+    """Size torch's intra-op thread pool, once per process.
+
+    The pool is process-wide and shared by alignment and diarization, which
+    overlap when diarization runs in parallel, so it is not capped per stage:
+    it gets ``diarization_threads`` if set, else every core. CTranslate2
+    decoding has its own thread count, part of the Whisper model's key.
+    """
+    global _torch_threads
+    if _torch_threads is not None:
+        return
+    _torch_threads = settings.diarization_threads or os.cpu_count() or 1
+    try:
+        import torch
+
+        torch.set_num_threads(_torch_threads)
+    except ImportError:
+        pass
+
+
+def whisper_size_mb(model_name: str, compute_type: str) -> int:
+    size = _WHISPER_SIZES_MB.get(model_name, _WHISPER_SIZES_MB["large-v3"])
+    return size // 2 if compute_type == "int8" else size
+
+
+class ModelRegistry:
+    """LRU cache of loaded models keyed by ``ModelKey``."""
+
+    def __init__(self, budget_mb: int):
+        self.budget_mb = budget_mb
+        self.stats = RegistryStats()
+        self._entries: OrderedDict[ModelKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[ModelKey, threading.Lock] = {}
+
+    def get(
+        self,
+        key: ModelKey,
+        loader: Callable[[], Any],
+        size_mb: int,
+        close: Callable[[Any], None] | None = None,
+    ) -> Any:
+        """Return the cached model for ``key``, loading it on a miss.
+
+        ``close`` is called with the model when it is evicted, for resources
+        that are not freed by dropping the reference (e.g. a process pool).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so different models can load in parallel,
+        # but never load the same model twice.
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return entry.model
+
+            logger.info("Loading model %s", _format_key(key))
+            started = time.perf_counter()
+            model = loader()
+            elapsed = time.perf_counter() - started
+            logger.info("Loaded model %s in %.1fs", _format_key(key), elapsed)
+
+            with self._lock:
+                self.stats.misses += 1
+                self.stats.load_seconds[_format_key(key)] = round(elapsed, 2)
+                self._entries[key] = _Entry(
+                    model=model, size_mb=size_mb, load_seconds=elapsed, close=close
+                )
+                self._evict(keep=key)
+            return model
+
+    def whisper(
+        self,
+        model_name: str,
+        language: str,
+        device: str,
+        compute_type: str,
+        threads: int | None = None,
+    ):
+        import whisperx
+
+        threads = threads or cpu_allocation()[0]
+
+        def load():
+            return whisperx.load_model(
+                model_name,
+                device,
+                compute_type=compute_type,
+                language=language,
+                threads=threads,
+            )
+
+        return self.get(
+            ("whisper", model_name, language, device, compute_type, threads),
+            load,
+            whisper_size_mb(model_name, compute_type),
+        )
+
+    def align(self, language: str, device: str):
+        import whisperx
+
+        def load():
+            return whisperx.load_align_model(language_code=language, device=device)
+
+        return self.get(("align", "default", language, device, None, None), load, _ALIGN_SIZE_MB)
+
+    def diarizer(self, device: str):
+        import whisperx
+
+        def load():
+            return whisperx.DiarizationPipeline(use_auth_token=settings.hf_token, device=device)
+
+        return self.get(
+            ("diarization", "pyannote", None, device, None, None), load, _DIARIZATION_SIZE_MB
+        )
+
+    def snapshot(self) -> dict:
+        """Return cache contents and counters, for logging and health checks."""
+        with self._lock:
+            return {
+                "budget_mb": self.budget_mb,
+                "used_mb": sum(e.size_mb for e in self._entries.values()),
+                "models": [_format_key(k) for k in self._entries],
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "evictions": self.stats.evictions,
+                "load_seconds": dict(self.stats.load_seconds),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            _close(entry)
+        _release_gpu_memory()
+
+    def _evict(self, keep: ModelKey) -> None:
+        used = sum(e.size_mb for e in self._entries.values())
+        evicted = False
+        for key in list(self._entries):
+            if used <= self.budget_mb:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            used -= entry.size_mb
+            _close(entry)
+            self.stats.evictions += 1
+            evicted = True
+            logger.info("Evicted model %s (budget %d MB)", _format_key(key), self.budget_mb)
+        if evicted:
+            _release_gpu_memory()
+
+
+def preload_models() -> None:
+    """Warm the registry with the configured models; called when a worker process starts."""
+    configure_torch_threads()
+    device, compute_type = get_device()
+    registry.whisper(settings.whisper_model, settings.whisper_language, device, compute_type)
+    registry.align(settings.whisper_language, device)
+    if settings.hf_token:
+        registry.diarizer(device)
+    logger.info("Model registry warm: %s", registry.snapshot())
+
+
+def _format_key(key: ModelKey) -> str:
+    return "/".join(str(part) for part in key if part)
+
+
+def _close(entry: _Entry) -> None:
+    if entry.close is not None:
+        try:
+            entry.close(entry.model)
+        except Exception:
+            logger.exception("Closing an evicted model failed")
+
+
+def _release_gpu_memory() -> None:
+    import gc
+
+    gc.collect()
+    if _cuda_available():
+        import torch
+
+        torch.cuda.empty_cache()
+
+
+def _cuda_available() -> bool:
+    try:
+        import torch
+
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+registry = ModelRegistry(settings.model_cache_budget_mb)
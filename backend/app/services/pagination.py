@@ -0,0 +1,36 @@
+"""Opaque keyset cursors over ``(created_at, id)``."""
+
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Geçersiz sayfa imleci")
+
+
+def set_next_cursor(response: Response, rows: list, limit: int) -> list:
+    """Trim the extra look-ahead row and advertise the next page in a header.
+
+    Queries fetch ``limit + 1`` rows; the list body stays the same shape as
+    before pagination existed.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        last = last[0] if isinstance(last, tuple) else last
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return rows
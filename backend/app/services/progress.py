@@ -0,0 +1,181 @@
+"""Processing progress events over Redis pub/sub.
+
+Workers publish small JSON events per meeting (stage start/end, share of
+audio transcribed with an ETA, segments persisted, completion). ASR threads
+use ``ProgressReporter`` with a synchronous client; coroutines on the shared
+worker loop use ``AsyncProgressReporter``, so a slow Redis never blocks the
+other tasks on the loop. The last event is also kept under its own key so a viewer that
+connects mid-stage sees the current state at once. The API relays events to
+browsers as Server-Sent Events.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator
+
+import redis
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_EVENTS = ("completed", "failed")
+_LAST_EVENT_TTL = 24 * 3600
+
+_client: redis.Redis | None = None
+_async_client: aioredis.Redis | None = None
+
+
+def _channel(meeting_id: int) -> str:
+    return f"ma:progress:meeting:{meeting_id}"
+
+
+def _sync_redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url)
+    return _client
+
+
+def _async_redis() -> aioredis.Redis:
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.from_url(settings.redis_url)
+    return _async_client
+
+
+def _payload(meeting_id: int, event: str, fields: dict) -> str:
+    return json.dumps({"meeting_id": meeting_id, "event": event, "ts": time.time(), **fields})
+
+
+class ProgressReporter:
+    """Publishes the progress of one meeting from ASR threads; never raises on Redis errors."""
+
+    def __init__(self, meeting_id: int):
+        self.meeting_id = meeting_id
+        self._started: dict[str, float] = {}
+
+    def publish(self, event: str, **fields) -> None:
+        payload = _payload(self.meeting_id, event, fields)
+        channel = _channel(self.meeting_id)
+        try:
+            pipe = _sync_redis().pipeline(transaction=False)
+            pipe.publish(channel, payload)
+            pipe.set(f"{channel}:last", payload, ex=_LAST_EVENT_TTL)
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Could not publish progress of meeting %d: %s", self.meeting_id, exc)
+
+    def started(self, stage: str) -> None:
+        self._started[stage] = time.monotonic()
+        self.publish("stage_started", stage=stage)
+
+    def completed(self, stage: str, **fields) -> None:
+        self.publish(
+            "stage_completed", stage=stage, seconds=round(self.elapsed(stage), 1), **fields
+        )
+
+    @contextmanager
+    def stage(self, name: str):
+        """Publish ``stage_started`` and, on success, ``stage_completed`` with its duration."""
+        self.started(name)
+        yield
+        self.completed(name)
+
+    def elapsed(self, stage: str) -> float:
+        return time.monotonic() - self._started.get(stage, time.monotonic())
+
+    def transcribed(self, done_seconds: float, total_seconds: float) -> None:
+        percent = 100.0 * done_seconds / total_seconds if total_seconds else 100.0
+        elapsed = self.elapsed("transcribe")
+        eta = elapsed * (100.0 - percent) / percent if percent > 0 else None
+        self.publish(
+            "transcribe_progress",
+            stage="transcribe",
+            percent=round(percent, 1),
+            eta_seconds=round(eta) if eta is not None else None,
+        )
+
+
+class AsyncProgressReporter:
+    """Publishes the progress of one meeting from coroutines; never raises on Redis errors."""
+
+    def __init__(self, meeting_id: int):
+        self.meeting_id = meeting_id
+        self._started: dict[str, float] = {}
+
+    async def publish(self, event: str, **fields) -> None:
+        await publish(self.meeting_id, event, **fields)
+
+    async def started(self, stage: str) -> None:
+        self._started[stage] = time.monotonic()
+        await self.publish("stage_started", stage=stage)
+
+    async def completed(self, stage: str, **fields) -> None:
+        seconds = time.monotonic() - self._started.get(stage, time.monotonic())
+        await self.publish("stage_completed", stage=stage, seconds=round(seconds, 1), **fields)
+
+
+async def publish(meeting_id: int, event: str, **fields) -> None:
+    """Async variant of ``ProgressReporter.publish`` for code on an event loop."""
+    payload = _payload(meeting_id, event, fields)
+    channel = _channel(meeting_id)
+    try:
+        async with _async_redis().pipeline(transaction=False) as pipe:
+            pipe.publish(channel, payload)
+            pipe.set(f"{channel}:last", payload, ex=_LAST_EVENT_TTL)
+            await pipe.execute()
+    except aioredis.RedisError as exc:
+        logger.warning("Could not publish progress of meeting %d: %s", meeting_id, exc)
+
+
+async def clear(meeting_id: int) -> None:
+    """Forget the last event, e.g. when a meeting is queued for processing again."""
+    try:
+        await _async_redis().delete(f"{_channel(meeting_id)}:last")
+    except aioredis.RedisError as exc:
+        logger.warning("Could not reset progress of meeting %d: %s", meeting_id, exc)
+
+
+async def event_stream(meeting_id: int, keepalive_seconds: float = 15.0) -> AsyncIterator[str]:
+    """Yield Server-Sent Events for a meeting until it completes or fails."""
+    channel = _channel(meeting_id)
+    pubsub = _async_redis().pubsub(ignore_subscribe_messages=True)
+    try:
+        # Subscribe before reading the last event so nothing falls in between.
+        await pubsub.subscribe(channel)
+        last = await _async_redis().get(f"{channel}:last")
+        if last is not None:
+            yield _sse(last)
+            if json.loads(last)["event"] in TERMINAL_EVENTS:
+                return
+        while True:
+            message = await pubsub.get_message(timeout=keepalive_seconds)
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            yield _sse(message["data"])
+            if json.loads(message["data"])["event"] in TERMINAL_EVENTS:
+                return
+    finally:
+        await pubsub.aclose()
+
+
+def status_event(meeting_id: int, status: str) -> str:
+    return _sse(json.dumps({"meeting_id": meeting_id, "event": "status", "status": status}))
+
+
+def _sse(payload: bytes | str) -> str:
+    if isinstance(payload, bytes):
+        payload = payload.decode()
+    return f"event: {json.loads(payload)['event']}\ndata: {payload}\n\n"
+
+
+async def close() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
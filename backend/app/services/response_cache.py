@@ -0,0 +1,126 @@
+"""Read-through Redis cache for per-meeting API responses.
+
+Entries are stored under the meeting's current version number. Writers call
+``invalidate_meeting`` after committing, which bumps the version so every
+cached response of that meeting is bypassed at once; stale entries expire by
+TTL. Each entry keeps an ETag of its body so repeat polls are answered with
+304 Not Modified. Redis errors never fail a request, the response is then
+built from the database as if caching were off.
+"""
+
+import hashlib
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+import redis.asyncio as redis
+from fastapi import Request, Response
+from pydantic_core import to_json
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PREFIX = "ma:cache:meeting"
+
+_client: redis.Redis | None = None
+_stats: Counter = Counter()
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.from_url(settings.response_cache_url or settings.redis_url)
+    return _client
+
+
+def _version_key(meeting_id: int) -> str:
+    return f"{_PREFIX}:{meeting_id}:version"
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def _respond(request: Request, body: bytes, etag: str, state: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Cache": state}
+    if _not_modified(request, etag):
+        _stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def cached_response(
+    request: Request,
+    meeting_id: int,
+    resource: str,
+    build: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Serve ``resource`` of a meeting from Redis, or build, store and serve it.
+
+    ``build`` returns a Pydantic model (or a list of them); HTTP errors it
+    raises, such as 404, are passed through and never cached.
+    """
+    if not settings.response_cache_enabled:
+        body = to_json(await build())
+        return _respond(request, body, _etag(body), "BYPASS")
+
+    key = None
+    try:
+        version = int(await _redis().get(_version_key(meeting_id)) or 0)
+        variant = str(request.query_params) or "-"
+        key = f"{_PREFIX}:{meeting_id}:v{version}:{resource}:{variant}"
+        cached = await _redis().get(key)
+    except redis.RedisError:
+        logger.warning("Response cache unavailable", exc_info=True)
+        _stats["errors"] += 1
+        cached = None
+
+    if cached is not None:
+        _stats[f"{resource}:hit"] += 1
+        etag, body = cached.split(b"\n", 1)
+        return _respond(request, body, etag.decode(), "HIT")
+
+    _stats[f"{resource}:miss"] += 1
+    body = to_json(await build())
+    etag = _etag(body)
+    if key is not None:
+        try:
+            await _redis().set(
+                key, etag.encode() + b"\n" + body, ex=settings.response_cache_ttl_seconds
+            )
+        except redis.RedisError:
+            logger.warning("Response cache unavailable", exc_info=True)
+            _stats["errors"] += 1
+    return _respond(request, body, etag, "MISS")
+
+
+async def invalidate_meeting(meeting_id: int) -> None:
+    """Drop all cached responses of a meeting; call after the write is committed.
+
+    The version is bumped even while caching is disabled, so entries written
+    before it was switched off are not served once it is switched back on.
+    """
+    try:
+        await _redis().incr(_version_key(meeting_id))
+    except redis.RedisError:
+        # Without the bump readers could see stale data until the TTL expires.
+        logger.error("Could not invalidate cached responses of meeting %d", meeting_id, exc_info=True)
+        _stats["errors"] += 1
+
+
+def stats() -> dict[str, int]:
+    """Hit/miss counters of this process since start."""
+    return dict(_stats)
+
+
+async def close() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
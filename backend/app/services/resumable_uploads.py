@@ -0,0 +1,236 @@
+"""Resumable chunked uploads with explicit offsets.
+
+A session owns a preallocated ``data.part`` file the size of the recording.
+Clients PUT fixed-size chunks at ``offset = index * chunk_size`` in any order
+and in parallel; each chunk is written in place and then recorded by a marker
+file, so the state survives API restarts and is shared by all API processes
+on the upload volume. Finalizing is refused while a chunk is still being
+written; it moves the assembled file next to the regular uploads, and the
+session then only remembers the file's hash, so repeating the request is
+answered instead of failing. Sessions idle for longer than
+``upload_session_ttl_hours`` are removed with their partial files.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+
+_WRITE_BYTES = 1024 * 1024
+# A chunk writer that has not written for this long is taken to have died.
+_WRITER_STALE_SECONDS = 600
+
+
+@dataclass
+class _SessionMeta:
+    meeting_id: int
+    filename: str
+    size: int
+    chunk_size: int
+    created_at: float
+
+
+class UploadSession:
+    def __init__(self, upload_id: str, meta: _SessionMeta):
+        self.upload_id = upload_id
+        self.meta = meta
+        self.path = _sessions_root() / upload_id
+
+    @classmethod
+    def create(cls, meeting_id: int, filename: str, size: int, chunk_size: int) -> "UploadSession":
+        upload_id = secrets.token_hex(16)
+        meta = _SessionMeta(
+            meeting_id=meeting_id,
+            filename=filename,
+            size=size,
+            chunk_size=chunk_size,
+            created_at=time.time(),
+        )
+        session = cls(upload_id, meta)
+        (session.path / "chunks").mkdir(parents=True)
+        with open(session.data_path, "wb") as f:
+            f.truncate(size)
+        (session.path / "session.json").write_text(json.dumps(asdict(meta)))
+        return session
+
+    @classmethod
+    def load(cls, upload_id: str) -> "UploadSession | None":
+        if not upload_id.isalnum():
+            return None
+        meta_file = _sessions_root() / upload_id / "session.json"
+        if not meta_file.exists():
+            return None
+        return cls(upload_id, _SessionMeta(**json.loads(meta_file.read_text())))
+
+    @property
+    def data_path(self) -> Path:
+        return self.path / "data.part"
+
+    @property
+    def total_chunks(self) -> int:
+        return max(1, -(-self.meta.size // self.meta.chunk_size))
+
+    def chunk_length(self, index: int) -> int:
+        start = index * self.meta.chunk_size
+        return min(self.meta.chunk_size, self.meta.size - start)
+
+    def received_chunks(self) -> list[int]:
+        if self.completed_sha256() is not None:
+            return list(range(self.total_chunks))
+        return sorted(int(p.name) for p in (self.path / "chunks").iterdir() if p.name.isdigit())
+
+    def contiguous_offset(self) -> int:
+        """Bytes received without gaps from the start of the file."""
+        offset = 0
+        for expected, index in enumerate(self.received_chunks()):
+            if index != expected:
+                break
+            offset += self.chunk_length(index)
+        return offset
+
+    async def write_chunk(self, offset: int, body: AsyncIterator[bytes]) -> None:
+        """Write one chunk at ``offset`` from a streamed request body."""
+        chunk_size = self.meta.chunk_size
+        if offset % chunk_size or not 0 <= offset < self.meta.size:
+            raise HTTPException(status_code=400, detail="Geçersiz parça konumu")
+        index = offset // chunk_size
+        expected = self.chunk_length(index)
+
+        # The in-flight marker is created before "completing" is checked and
+        # claim_completion checks for markers after creating "completing", so
+        # either this write or the completion backs off.
+        writer = await run_in_threadpool(self._register_writer)
+        try:
+            if (self.path / "completing").exists():
+                raise HTTPException(status_code=409, detail="Yükleme tamamlandı")
+            fd = await run_in_threadpool(os.open, self.data_path, os.O_WRONLY)
+            try:
+                written = 0
+                buffer = bytearray()
+                async for data in body:
+                    if written + len(buffer) + len(data) > expected:
+                        raise HTTPException(status_code=400, detail="Parça boyutu hatalı")
+                    buffer += data
+                    if len(buffer) >= _WRITE_BYTES:
+                        await run_in_threadpool(
+                            _pwrite_all, fd, bytes(buffer), offset + written, writer
+                        )
+                        written += len(buffer)
+                        buffer.clear()
+                if buffer:
+                    await run_in_threadpool(
+                        _pwrite_all, fd, bytes(buffer), offset + written, writer
+                    )
+                    written += len(buffer)
+            finally:
+                await run_in_threadpool(os.close, fd)
+        finally:
+            await run_in_threadpool(writer.unlink, missing_ok=True)
+
+        if written != expected:
+            raise HTTPException(status_code=400, detail="Parça eksik gönderildi")
+        # Mark only after the data is in place so a crash never records a partial chunk.
+        (self.path / "chunks" / str(index)).touch()
+
+    def claim_completion(self) -> bool:
+        """Reserve finalizing for the caller.
+
+        False if another request already has, or if a chunk is still being
+        written (a repeated PUT); the caller may retry once it has finished.
+        """
+        try:
+            os.close(os.open(self.path / "completing", os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        if self._has_writers():
+            self.release_completion()
+            return False
+        return True
+
+    def release_completion(self) -> None:
+        (self.path / "completing").unlink(missing_ok=True)
+
+    def assemble(self, dest: Path) -> str:
+        """Move the completed file to ``dest`` and return its SHA-256 (blocking)."""
+        digest = hashlib.sha256()
+        with open(self.data_path, "rb") as f:
+            while block := f.read(_WRITE_BYTES):
+                digest.update(block)
+        os.replace(self.data_path, dest)
+        return digest.hexdigest()
+
+    def mark_completed(self, sha256: str) -> None:
+        """Remember the finalized file's hash; the session is kept until it expires."""
+        (self.path / "completed").write_text(sha256)
+        shutil.rmtree(self.path / "chunks", ignore_errors=True)
+
+    def completed_sha256(self) -> str | None:
+        try:
+            return (self.path / "completed").read_text()
+        except FileNotFoundError:
+            return None
+
+    def discard(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _register_writer(self) -> Path:
+        writers = self.path / "writing"
+        writers.mkdir(exist_ok=True)
+        marker = writers / secrets.token_hex(8)
+        marker.touch()
+        return marker
+
+    def _has_writers(self) -> bool:
+        stale_before = time.time() - _WRITER_STALE_SECONDS
+        try:
+            markers = list((self.path / "writing").iterdir())
+        except FileNotFoundError:
+            return False
+        for marker in markers:
+            try:
+                if marker.stat().st_mtime >= stale_before:
+                    return True
+            except FileNotFoundError:
+                continue
+        return False
+
+
+def expire_stale_sessions() -> int:
+    """Remove sessions idle for longer than the TTL; returns how many (blocking)."""
+    root = _sessions_root()
+    if not root.exists():
+        return 0
+    cutoff = time.time() - settings.upload_session_ttl_hours * 3600
+    removed = 0
+    for path in root.iterdir():
+        try:
+            # Chunk markers and writes touch the chunks directory and data file.
+            last_activity = max(p.stat().st_mtime for p in (path, *path.iterdir()))
+        except FileNotFoundError:
+            continue
+        if last_activity < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int, writer: Path) -> None:
+    view = memoryview(data)
+    while view:
+        n = os.pwrite(fd, view, offset)
+        view, offset = view[n:], offset + n
+    os.utime(writer)  # still alive
+
+
+def _sessions_root() -> Path:
+    return Path(settings.upload_dir) / ".sessions"
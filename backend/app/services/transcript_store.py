@@ -0,0 +1,65 @@
+"""Bulk persistence of participants and transcript segments.
+
+Participants go in as one multi-row INSERT ... RETURNING; segments as a
+single executemany, or through asyncpg's binary COPY once a meeting has more
+than ``settings.segment_copy_threshold`` segments.
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.participant import Participant
+from app.models.transcript import TranscriptSegment
+
+_SEGMENT_COLUMNS = (
+    "meeting_id",
+    "participant_id",
+    "speaker_label",
+    "start_time",
+    "end_time",
+    "text",
+    "confidence",
+    "segment_order",
+)
+
+
+async def insert_participants(
+    db: AsyncSession, meeting_id: int, speakers: list[str]
+) -> dict[str, int]:
+    """Insert one participant per speaker label and return {speaker_label: id}."""
+    if not speakers:
+        return {}
+    result = await db.execute(
+        insert(Participant).returning(Participant.id, Participant.speaker_label),
+        [
+            {"meeting_id": meeting_id, "name": speaker, "speaker_label": speaker}
+            for speaker in speakers
+        ],
+    )
+    return {label: participant_id for participant_id, label in result}
+
+
+async def insert_segments(db: AsyncSession, rows: list[dict]) -> None:
+    """Insert transcript segment rows (dicts keyed by column name)."""
+    if not rows:
+        return
+    if len(rows) >= settings.segment_copy_threshold and _is_asyncpg(db):
+        await _copy_segments(db, rows)
+    else:
+        await db.execute(insert(TranscriptSegment), rows)
+
+
+async def _copy_segments(db: AsyncSession, rows: list[dict]) -> None:
+    # COPY runs on the session's own connection, inside its transaction.
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        TranscriptSegment.__tablename__,
+        records=[tuple(row.get(col) for col in _SEGMENT_COLUMNS) for row in rows],
+        columns=_SEGMENT_COLUMNS,
+    )
+
+
+def _is_asyncpg(db: AsyncSession) -> bool:
+    return db.get_bind().dialect.driver == "asyncpg"
@@ -0,0 +1,179 @@
+"""Streaming multipart upload handling for audio recordings.
+
+The request body is parsed as it arrives and the file part is written to
+disk in fixed-size pieces from a worker thread, hashing on the way, so API
+memory stays flat regardless of the recording size. Requests are rejected
+before any data is stored when the declared size or the part's content type
+is unacceptable.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from app.config import settings
+
+ALLOWED_EXTENSIONS = {".wav", ".mp3", ".m4a", ".ogg", ".oga", ".opus", ".flac", ".webm", ".mp4", ".aac"}
+_FLUSH_BYTES = 1024 * 1024
+
+
+@dataclass
+class StoredUpload:
+    path: Path
+    filename: str
+    size: int
+    sha256: str
+
+
+def is_allowed_audio(filename: str, content_type: str) -> bool:
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        return False
+    return (
+        content_type.startswith(("audio/", "video/"))
+        or content_type in ("", "application/octet-stream")
+    )
+
+
+class _FileSink:
+    """Writes the ``file`` part to ``<upload_dir>/<stem><ext>.part`` and hashes it."""
+
+    def __init__(self, upload_dir: Path, stem: str, max_bytes: int):
+        self.upload_dir = upload_dir
+        self.stem = stem
+        self.max_bytes = max_bytes
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.filename = ""
+        self.path: Path | None = None
+        self.error: HTTPException | None = None
+        self.pending: list[bytes] = []
+        self.pending_bytes = 0
+        self._file = None
+        self._in_file_part = False
+        self._headers: dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+
+    # Parser callbacks (synchronous, called from MultipartParser.write)
+
+    def on_part_begin(self):
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field, self._value = b"", b""
+
+    def on_headers_finished(self):
+        _, disposition = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._in_file_part = disposition.get(b"name") == b"file" and self.path is None
+        if not self._in_file_part:
+            return
+        self.filename = disposition.get(b"filename", b"audio.wav").decode("utf-8", "replace")
+        content_type = self._headers.get(b"content-type", b"").decode("latin-1").lower()
+        if not is_allowed_audio(self.filename, content_type):
+            self.error = HTTPException(status_code=415, detail="Desteklenmeyen dosya türü")
+            return
+        ext = os.path.splitext(self.filename)[1].lower()
+        self.path = self.upload_dir / f"{self.stem}{ext}"
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if not self._in_file_part or self.error:
+            return
+        self.size += end - start
+        if self.size > self.max_bytes:
+            self.error = HTTPException(status_code=413, detail="Dosya boyutu sınırı aşıldı")
+            return
+        self.pending.append(data[start:end])
+        self.pending_bytes += end - start
+
+    def on_part_end(self):
+        self._in_file_part = False
+
+    # Blocking file work, run in a thread
+
+    def flush(self):
+        if self._file is None:
+            self._file = open(self._part_path(), "wb")
+        for block in self.pending:
+            self.digest.update(block)
+            self._file.write(block)
+        self.pending.clear()
+        self.pending_bytes = 0
+
+    def commit(self) -> None:
+        self.flush()
+        self._file.close()
+        os.replace(self._part_path(), self.path)
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self.path is not None:
+            self._part_path().unlink(missing_ok=True)
+
+    def _part_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".part")
+
+
+async def receive_audio_upload(request: Request, stem: str) -> StoredUpload:
+    """Stream the ``file`` field of a multipart request into the upload directory."""
+    max_bytes = settings.max_upload_mb * 1024 * 1024
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + 64 * 1024:
+        raise HTTPException(status_code=413, detail="Dosya boyutu sınırı aşıldı")
+
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="multipart/form-data bekleniyor")
+
+    upload_dir = Path(settings.upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    sink = _FileSink(upload_dir, stem, max_bytes)
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": sink.on_part_begin,
+            "on_header_field": sink.on_header_field,
+            "on_header_value": sink.on_header_value,
+            "on_header_end": sink.on_header_end,
+            "on_headers_finished": sink.on_headers_finished,
+            "on_part_data": sink.on_part_data,
+            "on_part_end": sink.on_part_end,
+        },
+    )
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if sink.error:
+                raise sink.error
+            if sink.pending_bytes >= _FLUSH_BYTES:
+                await run_in_threadpool(sink.flush)
+        parser.finalize()
+        if sink.path is None:
+            raise HTTPException(status_code=400, detail="'file' alanı bulunamadı")
+        await run_in_threadpool(sink.commit)
+    except BaseException:
+        await run_in_threadpool(sink.abort)
+        raise
+
+    return StoredUpload(
+        path=sink.path, filename=sink.filename, size=sink.size, sha256=sink.digest.hexdigest()
+    )
@@ -0,0 +1,134 @@
+"""Lightweight energy-based voice activity helpers on 16 kHz mono audio."""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+
+
+def frame_energies(audio: np.ndarray, frame_seconds: float = FRAME_SECONDS) -> np.ndarray:
+    """Return the RMS energy of consecutive non-overlapping frames."""
+    frame = int(frame_seconds * SAMPLE_RATE)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = np.asarray(audio[: n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def find_split_points(
+    audio: np.ndarray, chunk_seconds: float, search_seconds: float = 30.0
+) -> list[float]:
+    """Return cut times (seconds) close to every ``chunk_seconds`` that fall in silence.
+
+    Each nominal cut is moved to the quietest half-second within
+    ``search_seconds`` of it, so chunks rarely split a word. The returned list
+    starts with 0.0 and ends with the audio duration.
+    """
+    duration = len(audio) / SAMPLE_RATE
+    if duration <= chunk_seconds:
+        return [0.0, duration]
+
+    energies = frame_energies(audio)
+    window = max(1, int(0.5 / FRAME_SECONDS))
+    smoothed = np.convolve(energies, np.ones(window) / window, mode="same")
+
+    cuts = [0.0]
+    nominal = chunk_seconds
+    while nominal < duration - chunk_seconds / 4:
+        lo = max(int((nominal - search_seconds) / FRAME_SECONDS), int(cuts[-1] / FRAME_SECONDS) + 1)
+        hi = min(int((nominal + search_seconds) / FRAME_SECONDS), len(smoothed))
+        if lo < hi:
+            cut = (lo + int(np.argmin(smoothed[lo:hi]))) * FRAME_SECONDS
+        else:
+            cut = nominal
+        cuts.append(cut)
+        nominal = cut + chunk_seconds
+    cuts.append(duration)
+    return cuts
+
+
+def speech_regions(
+    audio: np.ndarray, min_silence_seconds: float = 1.0, pad_seconds: float = 0.25
+) -> list[tuple[float, float]]:
+    """Return ``(start, end)`` seconds of the speech in ``audio``.
+
+    A frame is speech when it is 10 dB above the recording's noise floor (its
+    10th-percentile frame energy). Pauses shorter than ``min_silence_seconds``
+    stay inside a region and every region is widened by ``pad_seconds`` so
+    word onsets and endings are not clipped.
+    """
+    energies = frame_energies(audio)
+    if len(energies) == 0:
+        return []
+    threshold = max(3.16 * float(np.percentile(energies, 10)), 0.003)
+    speech = np.flatnonzero(energies > threshold)
+    if len(speech) == 0:
+        return []
+
+    # Runs of speech frames, joined across pauses shorter than min_silence_seconds.
+    gaps = np.flatnonzero(np.diff(speech) * FRAME_SECONDS > min_silence_seconds)
+    starts = np.concatenate(([speech[0]], speech[gaps + 1])) * FRAME_SECONDS
+    ends = (np.concatenate((speech[gaps], [speech[-1]])) + 1) * FRAME_SECONDS
+
+    duration = len(audio) / SAMPLE_RATE
+    regions: list[tuple[float, float]] = []
+    for start, end in zip(starts, ends):
+        start, end = max(0.0, start - pad_seconds), min(duration, end + pad_seconds)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], round(float(end), 3))
+        else:
+            regions.append((round(float(start), 3), round(float(end), 3)))
+    return regions
+
+
+@dataclass
+class SpeechIndex:
+    """Speech regions of a recording and the mapping from the compacted timeline.
+
+    The compacted audio is the regions laid end to end; ``to_original`` maps
+    a time in it back to the recording.
+    """
+
+    regions: list[tuple[float, float]]
+    duration: float
+
+    def __post_init__(self):
+        self.regions = [tuple(region) for region in self.regions]
+        self._offsets = [0.0]
+        for start, end in self.regions:
+            self._offsets.append(self._offsets[-1] + end - start)
+
+    @classmethod
+    def full(cls, duration: float) -> "SpeechIndex":
+        """Index that keeps the whole recording, i.e. maps every time to itself."""
+        return cls([(0.0, duration)], duration)
+
+    @property
+    def speech_seconds(self) -> float:
+        return self._offsets[-1]
+
+    @property
+    def silence_seconds(self) -> float:
+        return max(0.0, self.duration - self.speech_seconds)
+
+    @property
+    def silence_ratio(self) -> float:
+        return self.silence_seconds / self.duration if self.duration else 0.0
+
+    def to_original(self, t: float, end: bool = False) -> float:
+        """Map compacted time ``t`` to the recording.
+
+        A time on the seam of two regions belongs to the later region, or to
+        the earlier one for ``end`` times, so segments never span a removed gap
+        at their edges.
+        """
+        find = bisect_left if end else bisect_right
+        i = min(max(find(self._offsets, t) - 1, 0), len(self.regions) - 1)
+        return self.regions[i][0] + t - self._offsets[i]
+
+    def to_dict(self) -> dict:
+        return {"regions": self.regions, "duration": self.duration}
@@ -0,0 +1,92 @@
+"""Worker-lifetime asyncio loop and database engine.
+
+Each worker process runs one event loop in a background thread and binds the
+SQLAlchemy async engine to it, so pooled connections survive across tasks.
+Tasks submit coroutines with ``run_async``, which is safe to call from any
+pool thread; with ``-P threads`` concurrent tasks share the loop.
+"""
+
+import asyncio
+import logging
+import threading
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+
+# Tasks that may run at once in one process; set from the worker_init signal
+# (prefork children run one task at a time, thread pools run `concurrency`).
+tasks_per_process = 1
+
+
+def start() -> asyncio.AbstractEventLoop:
+    """Start the process loop and bind a fresh engine to it (idempotent)."""
+    global _loop, _thread
+    with _lock:
+        if _loop is not None:
+            return _loop
+
+        from app.database import configure_engine
+
+        # Connections inherited from a parent process or created on another
+        # loop must never be reused here.
+        configure_engine(
+            pool_size=tasks_per_process,
+            max_overflow=settings.worker_db_max_overflow,
+        )
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="worker-event-loop", daemon=True
+        )
+        thread.start()
+        _loop, _thread = loop, thread
+        logger.info("Worker event loop started (db pool size %d)", tasks_per_process)
+        return loop
+
+
+def run_async(coro):
+    """Run a coroutine on the process loop and block until it finishes."""
+    loop = _loop or start()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def stop() -> None:
+    """Dispose the engine and stop the loop; called on worker shutdown."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            return
+        from app.database import engine
+        from app.services import progress, response_cache
+        from app.services.llm import cache as llm_cache
+        from app.services.llm.factory import close_llm_providers
+
+        try:
+            asyncio.run_coroutine_threadsafe(engine.dispose(), _loop).result(timeout=10)
+        except Exception:
+            logger.exception("Failed to dispose database engine")
+        try:
+            asyncio.run_coroutine_threadsafe(response_cache.close(), _loop).result(timeout=10)
+        except Exception:
+            logger.exception("Failed to close response cache client")
+        try:
+            asyncio.run_coroutine_threadsafe(progress.close(), _loop).result(timeout=10)
+        except Exception:
+            logger.exception("Failed to close progress client")
+        try:
+            asyncio.run_coroutine_threadsafe(llm_cache.close(), _loop).result(timeout=10)
+        except Exception:
+            logger.exception("Failed to close LLM cache client")
+        try:
+            asyncio.run_coroutine_threadsafe(close_llm_providers(), _loop).result(timeout=10)
+        except Exception:
+            logger.exception("Failed to close LLM provider clients")
+        _loop.call_soon_threadsafe(_loop.stop)
+        _thread.join(timeout=10)
+        _loop.close()
+        _loop, _thread = None, None
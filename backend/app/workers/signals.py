@@ -0,0 +1,49 @@
+"""Celery worker lifecycle hooks."""
+
+import logging
+
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+
+from app.config import settings
+from app.workers import runtime
+
+logger = logging.getLogger(__name__)
+
+
+@worker_init.connect
+def size_worker_runtime(sender=None, **kwargs):
+    """Record how many tasks share one process, to size its DB pool."""
+    pool = getattr(sender, "pool_cls", None)
+    pool_name = pool if isinstance(pool, str) else getattr(pool, "__module__", "")
+    if "prefork" not in pool_name:
+        runtime.tasks_per_process = max(1, getattr(sender, "concurrency", 1) or 1)
+
+
+@worker_process_init.connect
+def start_worker_runtime(**kwargs):
+    runtime.start()
+
+
+@worker_process_init.connect
+def warm_model_registry(**kwargs):
+    """Load the configured WhisperX models once per worker process."""
+    if not settings.preload_models:
+        return
+    from app.services.model_registry import preload_models
+
+    try:
+        preload_models()
+    except Exception:
+        # A failed warm-up must not kill the worker; jobs will load lazily.
+        logger.exception("Model preload failed")
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_worker_runtime(**kwargs):
+    runtime.stop()
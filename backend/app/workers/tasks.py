@@ -1,34 +1,103 @@
-"""Celery background tasks for audio processing and LLM analysis."""
+"""Celery background tasks for audio processing and LLM analysis.
+
+Meeting processing runs as a chain of stage tasks: ASR on the ``asr`` queue,
+then persistence and the LLM stages on the ``llm`` queue (see celery_app.py).
+Each stage is idempotent and skips itself when ``Meeting.processing_stage``
+shows it already completed, so any stage can be retried or resumed alone.
+"""
 
 import asyncio
 import logging
 
-from sqlalchemy import select
+from celery import Task, chain
+from sqlalchemy import delete, select
 from sqlalchemy.orm import selectinload
 
+from app.config import settings
+from app.workers import runtime
 from celery_app import celery
 
 logger = logging.getLogger(__name__)
 
+# Lowest Redis priority step (0 is highest): refinement only runs on idle workers.
+REFINE_PRIORITY = 9
+
 
 def _run_async(coro):
-    """Run an async coroutine from synchronous Celery task."""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+    """Run an async coroutine from synchronous Celery task on the worker loop."""
+    return runtime.run_async(coro)
 
 
-@celery.task(bind=True, max_retries=2)
-def process_meeting_audio(self, meeting_id: int):
-    """Full pipeline: diarize → transcribe → summarize → extract tasks."""
-    try:
-        _run_async(_process_meeting_audio(meeting_id))
-    except Exception as exc:
-        logger.exception("Failed to process meeting %d", meeting_id)
+class PipelineStageTask(Task):
+    """Stage of the meeting pipeline; retried on error, marks the meeting failed at the end."""
+
+    autoretry_for = (Exception,)
+    max_retries = 2
+    default_retry_delay = 60
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        meeting_id = args[0] if args else kwargs["meeting_id"]
+        logger.error("Meeting %d failed in %s: %s", meeting_id, self.name, exc)
         _run_async(_set_meeting_failed(meeting_id))
-        raise self.retry(exc=exc, countdown=60)
+
+
+def meeting_pipeline(meeting_id: int):
+    """Build the stage chain for a meeting; completed stages are no-ops."""
+    return chain(
+        transcribe_meeting.si(meeting_id),
+        persist_transcript.si(meeting_id),
+        analyze_meeting.si(meeting_id),
+    )
+
+
+@celery.task(bind=True)
+def process_meeting_audio(self, meeting_id: int):
+    """Full pipeline: diarize → transcribe → summarize and extract tasks."""
+    raise self.replace(meeting_pipeline(meeting_id))
+
+
+@celery.task(base=PipelineStageTask)
+def transcribe_meeting(meeting_id: int):
+    """ASR stage: decode, transcribe, align and diarize into stage checkpoints."""
+    _run_async(_transcribe_meeting(meeting_id))
+
+
+@celery.task(base=PipelineStageTask)
+def persist_transcript(meeting_id: int):
+    """Write participants and transcript segments from the ASR checkpoint."""
+    _run_async(_persist_transcript(meeting_id))
+
+
+@celery.task(base=PipelineStageTask)
+def analyze_meeting(meeting_id: int):
+    """LLM stage: summary and tasks, then mark the meeting completed."""
+    _run_async(_analyze_meeting(meeting_id))
+
+
+# Stages of pipelines queued before summary and tasks became one stage.
+@celery.task(base=PipelineStageTask)
+def summarize_meeting(meeting_id: int):
+    _run_async(_analyze_meeting(meeting_id))
+
+
+@celery.task(base=PipelineStageTask)
+def extract_meeting_tasks(meeting_id: int):
+    _run_async(_analyze_meeting(meeting_id))
+
+
+@celery.task(autoretry_for=(Exception,), max_retries=2, default_retry_delay=300)
+def refine_meeting_transcript(meeting_id: int, audio_sha256: str):
+    """Background tier: re-run full ASR on a draft transcript, then swap it in."""
+    if _run_async(_refine_transcript(meeting_id, audio_sha256)):
+        swap_refined_transcript.apply_async(
+            (meeting_id, audio_sha256), priority=REFINE_PRIORITY
+        )
+
+
+@celery.task(autoretry_for=(Exception,), max_retries=2, default_retry_delay=60)
+def swap_refined_transcript(meeting_id: int, audio_sha256: str):
+    """Replace a draft transcript and its summary with the refined ones."""
+    _run_async(_swap_refined_transcript(meeting_id, audio_sha256))
 
 
 @celery.task
@@ -43,124 +112,331 @@ def generate_progress_report(meeting_id: int | None, report_type: str):
     _run_async(_generate_report(meeting_id, report_type))
 
 
-async def _process_meeting_audio(meeting_id: int):
-    from app.database import async_session
-    from app.models.meeting import Meeting, MeetingStatus
+async def _get_meeting(db, meeting_id: int):
+    from app.models.meeting import Meeting
+
+    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+    return result.scalar_one()
+
+
+async def _load_transcript(db, meeting_id: int) -> tuple[str, list]:
+    """Return (transcript text for the LLM, participants) from the database."""
     from app.models.participant import Participant
-    from app.models.summary import Summary
-    from app.models.task import Task, TaskPriority
     from app.models.transcript import TranscriptSegment
+
+    result = await db.execute(
+        select(TranscriptSegment.speaker_label, TranscriptSegment.text)
+        .where(TranscriptSegment.meeting_id == meeting_id)
+        .order_by(TranscriptSegment.segment_order)
+    )
+    transcript_text = "\n".join(f"[{speaker}]: {text}" for speaker, text in result)
+
+    result = await db.execute(select(Participant).where(Participant.meeting_id == meeting_id))
+    return transcript_text, list(result.scalars())
+
+
+def _asr_policy(meeting):
+    from app.models.meeting import AsrPolicy
+
+    return meeting.asr_policy or AsrPolicy(settings.asr_policy)
+
+
+def _set_audio_stats(meeting, checkpoints) -> None:
+    """Recording length, skipped silence and ASR wall time of the run in ``checkpoints``."""
+    from app.services.checkpoints import ASR_STAGES
+    from app.services.vad import SpeechIndex
+
+    speech_index = checkpoints.get("vad")
+    if speech_index is not None:
+        index = SpeechIndex(**speech_index)
+        meeting.audio_seconds = index.duration
+        meeting.silence_seconds = index.silence_seconds
+    times = checkpoints.times()
+    if any(stage in times for stage in ASR_STAGES):
+        meeting.asr_seconds = sum(times.get(stage, 0.0) for stage in ASR_STAGES)
+
+
+def _segment_rows(meeting_id: int, segments: list[dict], speaker_ids: dict) -> list[dict]:
+    return [
+        {
+            "meeting_id": meeting_id,
+            "participant_id": speaker_ids[seg["speaker"]],
+            "speaker_label": seg["speaker"],
+            "start_time": seg["start"],
+            "end_time": seg["end"],
+            "text": seg["text"],
+            "segment_order": i,
+        }
+        for i, seg in enumerate(segments)
+    ]
+
+
+async def _transcribe_meeting(meeting_id: int):
+    from app.database import async_session
+    from app.models.meeting import AsrPolicy
     from app.services.audio_processor import process_audio
-    from app.services.summarizer import generate_summary
-    from app.services.task_extractor import extract_tasks
+    from app.services.checkpoints import StageCheckpoints, stage_done
+    from app.services.progress import ProgressReporter
 
     async with async_session() as db:
-        result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
-        meeting = result.scalar_one()
+        meeting = await _get_meeting(db, meeting_id)
+        if stage_done(meeting.processing_stage, "assign"):
+            return
+        audio_file_path, audio_sha256 = meeting.audio_file_path, meeting.audio_sha256
+        draft = _asr_policy(meeting) != AsrPolicy.ACCURATE
+
+    # Step 1: Audio processing (diarization + transcription); the result is
+    # left in the "assign" checkpoint for the persist stage. It runs off the
+    # shared loop so other coroutines in this process keep going.
+    logger.info("Processing audio for meeting %d: %s", meeting_id, audio_file_path)
+    await asyncio.to_thread(
+        process_audio,
+        audio_file_path,
+        audio_sha256,
+        checkpoints=StageCheckpoints(meeting_id),
+        progress=ProgressReporter(meeting_id),
+        draft=draft,
+    )
+
+
+async def _persist_transcript(meeting_id: int):
+    from app.database import async_session
+    from app.models.meeting import AsrPolicy
+    from app.models.participant import Participant
+    from app.models.transcript import TranscriptSegment
+    from app.services import response_cache
+    from app.services.checkpoints import StageCheckpoints, stage_done
+    from app.services.progress import AsyncProgressReporter
+    from app.services.transcript_store import insert_participants, insert_segments
 
-        # Step 1: Audio processing (diarization + transcription)
-        logger.info("Processing audio for meeting %d: %s", meeting_id, meeting.audio_file_path)
-        segments = process_audio(meeting.audio_file_path)
+    progress = AsyncProgressReporter(meeting_id)
+    async with async_session() as db:
+        meeting = await _get_meeting(db, meeting_id)
+        if stage_done(meeting.processing_stage, "persist"):
+            return
+        await progress.started("persist")
+        segments = StageCheckpoints(meeting_id).get("assign")
+        if segments is None:
+            raise RuntimeError(f"No ASR output for meeting {meeting_id}")
+
+        # Rows from an earlier attempt that failed mid-way are replaced, not duplicated.
+        await db.execute(
+            delete(TranscriptSegment).where(TranscriptSegment.meeting_id == meeting_id)
+        )
+        await db.execute(delete(Participant).where(Participant.meeting_id == meeting_id))
 
-        # Step 2: Save participants (unique speakers)
-        speakers = set(seg["speaker"] for seg in segments)
-        speaker_to_participant = {}
-        for speaker in speakers:
-            participant = Participant(
-                meeting_id=meeting_id,
-                name=speaker,
-                speaker_label=speaker,
-            )
-            db.add(participant)
-            await db.flush()
-            speaker_to_participant[speaker] = participant
-
-        # Step 3: Save transcript segments
-        for i, seg in enumerate(segments):
-            participant = speaker_to_participant[seg["speaker"]]
-            db_seg = TranscriptSegment(
-                meeting_id=meeting_id,
-                participant_id=participant.id,
-                speaker_label=seg["speaker"],
-                start_time=seg["start"],
-                end_time=seg["end"],
-                text=seg["text"],
-                segment_order=i,
-            )
-            db.add(db_seg)
+        # Step 2: Save participants (unique speakers), one INSERT ... RETURNING
+        speakers = sorted(set(seg["speaker"] for seg in segments))
+        speaker_ids = await insert_participants(db, meeting_id, speakers)
+
+        # Step 3: Save transcript segments in bulk
+        await insert_segments(db, _segment_rows(meeting_id, segments, speaker_ids))
 
         # Step 4: Calculate duration
         if segments:
             meeting.duration_seconds = int(segments[-1]["end"])
+        _set_audio_stats(meeting, StageCheckpoints(meeting_id))
+
+        # Draft and tiered meetings get a fast, undiarized transcript first. The
+        # resolved policy is stored so clients know whether a refinement follows.
+        meeting.asr_policy = _asr_policy(meeting)
+        meeting.transcript_draft = meeting.asr_policy != AsrPolicy.ACCURATE
+        meeting.asr_model = (
+            settings.draft_whisper_model if meeting.transcript_draft else settings.whisper_model
+        )
+        meeting.asr_language = settings.whisper_language
+        meeting.processing_stage = "persist"
+        await db.commit()
+    await response_cache.invalidate_meeting(meeting_id)
+    await progress.publish("segments_persisted", stage="persist", segments=len(segments))
+    await progress.completed("persist", segments=len(segments))
 
-        await db.flush()
 
-        # Step 5: Build full transcript text for LLM
-        transcript_text = "\n".join(
-            f"[{seg['speaker']}]: {seg['text']}" for seg in segments
-        )
-        participant_names = [p.name for p in speaker_to_participant.values()]
+async def _analyze_meeting(meeting_id: int):
+    from app.database import async_session
+    from app.models.meeting import AsrPolicy, MeetingStatus
+    from app.models.summary import Summary
+    from app.models.task import Task, TaskPriority
+    from app.services import response_cache
+    from app.services.checkpoints import StageCheckpoints, stage_done
+    from app.services.meeting_analysis import analyze_transcript
+    from app.services.progress import AsyncProgressReporter
 
-        # Step 6: LLM - Generate summary
-        logger.info("Generating summary for meeting %d", meeting_id)
-        summary_data = await generate_summary(transcript_text)
-        summary = Summary(
-            meeting_id=meeting_id,
-            full_summary=summary_data.get("full_summary", ""),
-            key_points=summary_data.get("key_points", []),
-            decisions=summary_data.get("decisions", []),
-        )
-        db.add(summary)
-
-        # Step 7: LLM - Extract tasks
-        logger.info("Extracting tasks for meeting %d", meeting_id)
-        tasks_data = await extract_tasks(transcript_text, participant_names)
-        for task_data in tasks_data:
-            # Try to match assignee to a participant
-            assignee_id = None
-            assignee_name = task_data.get("assignee")
-            if assignee_name:
-                for speaker, participant in speaker_to_participant.items():
-                    if participant.name == assignee_name:
-                        assignee_id = participant.id
-                        break
-
-            priority_str = task_data.get("priority", "medium")
-            try:
-                priority = TaskPriority(priority_str)
-            except ValueError:
-                priority = TaskPriority.MEDIUM
-
-            task = Task(
-                meeting_id=meeting_id,
-                assignee_id=assignee_id,
-                title=task_data.get("title", ""),
-                description=task_data.get("description"),
-                priority=priority,
+    progress = AsyncProgressReporter(meeting_id)
+    async with async_session() as db:
+        meeting = await _get_meeting(db, meeting_id)
+        if not stage_done(meeting.processing_stage, "extract_tasks"):
+            await progress.started("analyze")
+            transcript_text, participants = await _load_transcript(db, meeting_id)
+            participant_names = [p.name for p in participants]
+
+            # Steps 5-6: LLM - summary and tasks, both from the transcript alone
+            logger.info("Analyzing meeting %d", meeting_id)
+            summary_data, tasks_data, run = await analyze_transcript(
+                meeting_id, transcript_text, participant_names
+            )
+            db.add(run)
+
+            # Replaced, not added to, if the meeting was analyzed before.
+            await db.execute(delete(Summary).where(Summary.meeting_id == meeting_id))
+            await db.execute(delete(Task).where(Task.meeting_id == meeting_id))
+            db.add(
+                Summary(
+                    meeting_id=meeting_id,
+                    full_summary=summary_data.get("full_summary", ""),
+                    key_points=summary_data.get("key_points", []),
+                    decisions=summary_data.get("decisions", []),
+                )
             )
-            db.add(task)
 
-        # Step 8: Mark as completed
+            for task_data in tasks_data:
+                # Try to match assignee to a participant
+                assignee_id = None
+                assignee_name = task_data.get("assignee")
+                if assignee_name:
+                    for participant in participants:
+                        if participant.name == assignee_name:
+                            assignee_id = participant.id
+                            break
+
+                priority_str = task_data.get("priority", "medium")
+                try:
+                    priority = TaskPriority(priority_str)
+                except ValueError:
+                    priority = TaskPriority.MEDIUM
+
+                task = Task(
+                    meeting_id=meeting_id,
+                    assignee_id=assignee_id,
+                    title=task_data.get("title", ""),
+                    description=task_data.get("description"),
+                    priority=priority,
+                )
+                db.add(task)
+            meeting.processing_stage = "extract_tasks"
+
+        # Step 7: Mark as completed
         meeting.status = MeetingStatus.COMPLETED
         await db.commit()
+        await response_cache.invalidate_meeting(meeting_id)
+        await progress.completed("analyze")
+        await progress.publish("completed", status=MeetingStatus.COMPLETED.value)
+        StageCheckpoints(meeting_id).clear()
         logger.info("Meeting %d processing completed", meeting_id)
 
+    if meeting.transcript_draft and _asr_policy(meeting) == AsrPolicy.TIERED:
+        refine_meeting_transcript.apply_async(
+            (meeting_id, meeting.audio_sha256), priority=REFINE_PRIORITY
+        )
+
+
+async def _refine_transcript(meeting_id: int, audio_sha256: str) -> bool:
+    """Run full ASR into the "refine" checkpoints; False if there is nothing to refine."""
+    from app.database import async_session
+    from app.models.meeting import Meeting
+    from app.services.audio_processor import process_audio
+    from app.services.checkpoints import StageCheckpoints
+
+    checkpoints = StageCheckpoints(meeting_id, "refine")
+    async with async_session() as db:
+        meeting = await db.get(Meeting, meeting_id)
+        if (
+            meeting is None
+            or meeting.audio_sha256 != audio_sha256
+            or not meeting.transcript_draft
+        ):
+            checkpoints.clear()
+            return False
+        audio_file_path = meeting.audio_file_path
+
+    logger.info("Refining draft transcript of meeting %d", meeting_id)
+    await asyncio.to_thread(process_audio, audio_file_path, audio_sha256, checkpoints=checkpoints)
+    return True
+
+
+async def _swap_refined_transcript(meeting_id: int, audio_sha256: str):
+    from app.database import async_session
+    from app.models.meeting import Meeting
+    from app.models.participant import Participant
+    from app.models.summary import Summary
+    from app.models.transcript import TranscriptSegment
+    from app.services import response_cache
+    from app.services.checkpoints import StageCheckpoints
+    from app.services.meeting_analysis import summarize_transcript
+    from app.services.transcript_store import insert_participants, insert_segments
+
+    checkpoints = StageCheckpoints(meeting_id, "refine")
+    segments = checkpoints.get("assign")
+    if segments is None:
+        raise RuntimeError(f"No refined ASR output for meeting {meeting_id}")
+
+    # The summary is built before the transaction so the draft stays readable meanwhile.
+    transcript_text = "\n".join(f"[{seg['speaker']}]: {seg['text']}" for seg in segments)
+    summary_data, run = await summarize_transcript(meeting_id, transcript_text)
+
+    async with async_session() as db:
+        meeting = await db.get(Meeting, meeting_id, with_for_update=True)
+        if (
+            meeting is None
+            or meeting.audio_sha256 != audio_sha256
+            or not meeting.transcript_draft
+        ):
+            checkpoints.clear()
+            return
+
+        # Tasks are kept: they may already be edited or assigned by users. Their
+        # draft-speaker assignees go away with the participants (SET NULL).
+        await db.execute(
+            delete(TranscriptSegment).where(TranscriptSegment.meeting_id == meeting_id)
+        )
+        await db.execute(delete(Participant).where(Participant.meeting_id == meeting_id))
+        speakers = sorted(set(seg["speaker"] for seg in segments))
+        speaker_ids = await insert_participants(db, meeting_id, speakers)
+        await insert_segments(db, _segment_rows(meeting_id, segments, speaker_ids))
+
+        await db.execute(delete(Summary).where(Summary.meeting_id == meeting_id))
+        db.add(
+            Summary(
+                meeting_id=meeting_id,
+                full_summary=summary_data.get("full_summary", ""),
+                key_points=summary_data.get("key_points", []),
+                decisions=summary_data.get("decisions", []),
+            )
+        )
+        db.add(run)
+        if segments:
+            meeting.duration_seconds = int(segments[-1]["end"])
+        _set_audio_stats(meeting, checkpoints)
+        meeting.transcript_draft = False
+        meeting.asr_model = settings.whisper_model
+        meeting.asr_language = settings.whisper_language
+        await db.commit()
+
+    await response_cache.invalidate_meeting(meeting_id)
+    checkpoints.clear()
+    logger.info("Meeting %d transcript refined (%d segments)", meeting_id, len(segments))
+
 
 async def _set_meeting_failed(meeting_id: int):
     from app.database import async_session
     from app.models.meeting import Meeting, MeetingStatus
+    from app.services import progress, response_cache
 
     async with async_session() as db:
         result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
         meeting = result.scalar_one()
         meeting.status = MeetingStatus.FAILED
         await db.commit()
+    await response_cache.invalidate_meeting(meeting_id)
+    await progress.publish(meeting_id, "failed", status=MeetingStatus.FAILED.value)
 
 
 async def _regenerate_summary(meeting_id: int):
     from app.database import async_session
     from app.models.summary import Summary
     from app.models.transcript import TranscriptSegment
+    from app.services import response_cache
+    from app.services.llm import cache as llm_cache
     from app.services.summarizer import generate_summary
 
     async with async_session() as db:
@@ -174,7 +450,9 @@ async def _regenerate_summary(meeting_id: int):
             f"[{seg.speaker_label}]: {seg.text}" for seg in segments
         )
 
-        summary_data = await generate_summary(transcript_text)
+        # A regeneration is asked for a different answer, not the cached one.
+        with llm_cache.bypass():
+            summary_data = await generate_summary(transcript_text)
 
         # Update or create summary
         result = await db.execute(
@@ -195,6 +473,7 @@ async def _regenerate_summary(meeting_id: int):
             db.add(summary)
 
         await db.commit()
+    await response_cache.invalidate_meeting(meeting_id)
 
 
 async def _generate_report(meeting_id: int | None, report_type: str):
@@ -0,0 +1,52 @@
+"""Compare time to a usable transcript for the draft and accurate ASR tiers.
+
+Reports wall time and real-time factor (processing seconds per audio second)
+of ``process_audio`` in draft mode (small model, no alignment or diarization)
+and in accurate mode (full model with alignment and diarization).
+
+Usage (from backend/):
+    python -m benchmarks.bench_asr_tiers --seconds 300 --device cpu
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.services.audio_processor import process_audio
+from app.services.model_registry import get_device
+from benchmarks.fixtures import synthetic_meeting_audio, write_wav
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=300)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument(
+        "--device", choices=("cpu", "cuda"), help="default: cuda when available"
+    )
+    args = parser.parse_args()
+    if args.device:
+        settings.device = args.device
+
+    print(
+        f"draft={settings.draft_whisper_model} full={settings.whisper_model} "
+        f"device={get_device()[0]}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_wav(Path(tmp) / "meeting.wav", synthetic_meeting_audio(args.seconds))
+        for tier, draft in (("draft", True), ("accurate", False)):
+            # Model load time is excluded: the first run only warms the registry.
+            process_audio(str(path), draft=draft)
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                process_audio(str(path), draft=draft)
+                timings.append(time.perf_counter() - started)
+            best = min(timings)
+            print(f"{tier:<9} best={best:.2f}s rtf={best / args.seconds:.3f}")
+
+
+if __name__ == "__main__":
+    main()
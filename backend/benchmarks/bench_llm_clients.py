@@ -0,0 +1,95 @@
+"""Per-call overhead of a fresh HTTP client per request vs. the pooled provider client.
+
+Starts a local stub of Ollama's ``/api/generate`` that answers at once, so
+the timings are client-side overhead only: connection setup and client
+construction. Runs the same number of sequential and concurrent calls with
+a new ``httpx.AsyncClient`` per request (the previous behaviour) and with
+the shared ``OllamaProvider`` client.
+
+Usage (from backend/):
+    python -m benchmarks.bench_llm_clients --calls 500 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.config import settings
+from app.services.llm.ollama_provider import OllamaProvider
+
+_BODY = json.dumps({"response": "{}", "prompt_eval_count": 10, "eval_count": 2}).encode()
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, delayed
+        # ACKs add ~40 ms to every response on a reused connection.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+async def _fresh_client_call(base_url: str) -> None:
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        response = await client.post(
+            f"{base_url}/api/generate", json={"model": "stub", "prompt": "x", "stream": False}
+        )
+        response.raise_for_status()
+
+
+async def _run(call, calls: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            await call()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(calls)))
+    return (time.perf_counter() - started) / calls * 1000
+
+
+async def main(calls: int, concurrency: int):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    settings.ollama_base_url = base_url
+    provider = OllamaProvider()
+
+    try:
+        for label, parallel in (("sequential", 1), (f"concurrency={concurrency}", concurrency)):
+            fresh = await _run(lambda: _fresh_client_call(base_url), calls, parallel)
+            pooled = await _run(lambda: provider.generate("x"), calls, parallel)
+            print(
+                f"{label:<16} fresh client {fresh:6.2f} ms/call   "
+                f"pooled client {pooled:6.2f} ms/call   ({fresh / pooled:.1f}x)"
+            )
+    finally:
+        await provider.aclose()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.concurrency))
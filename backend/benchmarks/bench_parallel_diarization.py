@@ -0,0 +1,41 @@
+"""Compare sequential and parallel diarization wall time in process_audio.
+
+Usage (from backend/):
+    python -m benchmarks.bench_parallel_diarization --seconds 300
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.config import settings
+from app.services.audio_processor import process_audio
+from app.services.model_registry import preload_models
+from benchmarks.fixtures import synthetic_meeting_audio, write_wav
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=300)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_wav(Path(tmp) / "meeting.wav", synthetic_meeting_audio(args.seconds))
+        # Model load time is excluded: both modes use the warm registry.
+        preload_models()
+
+        for parallel in (False, True):
+            settings.parallel_diarization = parallel
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                process_audio(str(path))
+                timings.append(time.perf_counter() - started)
+            mode = "parallel" if parallel else "sequential"
+            print(f"{mode:<11} best={min(timings):.2f}s runs={[round(t, 2) for t in timings]}")
+
+
+if __name__ == "__main__":
+    main()
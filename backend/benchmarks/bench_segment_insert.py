@@ -0,0 +1,79 @@
+"""Rows/second for persisting transcript segments.
+
+Compares the old per-object ORM path with executemany and asyncpg COPY for
+1k, 10k and 100k segments. Every run happens in a transaction that is rolled
+back, so the database is left unchanged.
+
+Usage (from backend/, with the database from docker-compose running):
+    python -m benchmarks.bench_segment_insert --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import insert
+
+from app.database import async_session
+from app.models.meeting import Meeting
+from app.models.transcript import TranscriptSegment
+from app.services import transcript_store
+
+
+def _rows(meeting_id: int, participant_ids: list[int], n: int) -> list[dict]:
+    return [
+        {
+            "meeting_id": meeting_id,
+            "participant_id": participant_ids[i % len(participant_ids)],
+            "speaker_label": f"SPEAKER_{i % len(participant_ids):02d}",
+            "start_time": i * 3.0,
+            "end_time": i * 3.0 + 2.5,
+            "text": "Bu bir deneme cümlesidir, toplantı notu olarak kaydediliyor.",
+            "segment_order": i,
+        }
+        for i in range(n)
+    ]
+
+
+async def _orm_per_object(db, rows):
+    for row in rows:
+        db.add(TranscriptSegment(**row))
+    await db.flush()
+
+
+async def _executemany(db, rows):
+    await db.execute(insert(TranscriptSegment), rows)
+
+
+async def _copy(db, rows):
+    await transcript_store._copy_segments(db, rows)
+
+
+async def _run(method, n: int) -> float:
+    async with async_session() as db:
+        meeting = Meeting(title="bench")
+        db.add(meeting)
+        await db.flush()
+        speakers = [f"SPEAKER_{i:02d}" for i in range(4)]
+        ids = await transcript_store.insert_participants(db, meeting.id, speakers)
+        rows = _rows(meeting.id, [ids[s] for s in speakers], n)
+
+        started = time.perf_counter()
+        await method(db, rows)
+        elapsed = time.perf_counter() - started
+        await db.rollback()
+    return n / elapsed
+
+
+async def main(sizes: list[int]) -> None:
+    methods = {"orm add()": _orm_per_object, "executemany": _executemany, "COPY": _copy}
+    print(f"{'rows':>8} " + " ".join(f"{name:>14}" for name in methods))
+    for n in sizes:
+        rates = [await _run(method, n) for method in methods.values()]
+        print(f"{n:>8} " + " ".join(f"{rate:>12,.0f}/s" for rate in rates))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    asyncio.run(main(parser.parse_args().sizes))
@@ -0,0 +1,78 @@
+"""Per-task overhead of running async work from a Celery task.
+
+"before" reproduces the old _run_async: a new event loop per task, and a new
+engine because pooled connections cannot cross loops. "after" submits to the
+worker-lifetime loop and engine from app.workers.runtime.
+
+Usage (from backend/, with the database from docker-compose running):
+    python -m benchmarks.bench_task_dispatch --tasks 500
+    python -m benchmarks.bench_task_dispatch --no-db   # loop overhead only
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.workers import runtime
+
+
+async def _noop():
+    return None
+
+
+async def _query_with_new_engine():
+    engine = create_async_engine(settings.database_url)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+
+async def _query_with_shared_engine():
+    from app.database import async_session
+
+    async with async_session() as db:
+        await db.execute(text("SELECT 1"))
+
+
+def _run_new_loop(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _measure(label: str, n: int, dispatch, make_coro) -> None:
+    dispatch(make_coro())  # warm-up
+    started = time.perf_counter()
+    for _ in range(n):
+        dispatch(make_coro())
+    per_task = (time.perf_counter() - started) / n * 1000
+    print(f"{label:<28} {per_task:8.3f} ms/task")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--no-db", action="store_true")
+    args = parser.parse_args()
+
+    runtime.start()
+    try:
+        _measure("before: new loop", args.tasks, _run_new_loop, _noop)
+        _measure("after: worker loop", args.tasks, runtime.run_async, _noop)
+        if not args.no_db:
+            _measure("before: new loop + engine", args.tasks, _run_new_loop, _query_with_new_engine)
+            _measure("after: worker loop + pool", args.tasks, runtime.run_async, _query_with_shared_engine)
+    finally:
+        runtime.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Check that the API's hot queries are served by indexes.
+
+Loads synthetic meetings, participants, segments, tasks and reports with
+``generate_series`` inside a transaction, runs ANALYZE, and EXPLAINs each
+query. A query whose plan contains a sequential scan is reported and the
+script exits non-zero. The search endpoint's query is also timed with
+EXPLAIN ANALYZE for a rare and a common term, and fails above
+``--search-budget-ms``. The transaction is rolled back at the end.
+
+Usage (from backend/, after ``alembic upgrade head``; 1M segments):
+    python -m benchmarks.check_query_plans --meetings 20000 --segments 50
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+
+from sqlalchemy import literal_column, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.database import async_session, engine
+from app.models.meeting import Meeting, MeetingStatus
+from app.models.participant import Participant
+from app.models.report import ProgressReport
+from app.models.task import Task, TaskStatus
+from app.models.transcript import TranscriptSegment
+from app.routers.search import search_query
+from app.routers.tasks import task_list_query
+from app.schemas.search import SearchKind
+
+_POPULATE = [
+    """
+    INSERT INTO meetings (title, date, status, audio_sha256, created_at, updated_at)
+    SELECT 'bench ' || g, now() - g * interval '1 hour',
+           (ARRAY['UPLOADING','PROCESSING','COMPLETED','FAILED'])[1 + g % 4]::meetingstatus,
+           md5(g::text) || md5((g + 1)::text),
+           now() - g * interval '1 minute', now()
+    FROM generate_series(1, :meetings) g
+    """,
+    """
+    INSERT INTO participants (meeting_id, name, speaker_label)
+    SELECT m.id, 'SPEAKER_0' || s, 'SPEAKER_0' || s
+    FROM meetings m, generate_series(0, 3) s
+    """,
+    """
+    INSERT INTO transcript_segments
+        (meeting_id, speaker_label, start_time, end_time, text, segment_order)
+    SELECT m.id, 'SPEAKER_00', s * 3.0, s * 3.0 + 2.5,
+           CASE WHEN (m.id + s * 7919) % 10000 = 0 THEN 'bütçe onayı bekleniyor'
+                ELSE (ARRAY['deneme cümlesi', 'proje takvimi güncellendi',
+                            'müşteri görüşmesi yapıldı', 'sunum hazırlandı'])[1 + (m.id + s) % 4]
+           END,
+           s
+    FROM meetings m, generate_series(0, :segments - 1) s
+    """,
+    """
+    INSERT INTO tasks (meeting_id, assignee_id, title, priority, status, due_date,
+                       created_at, updated_at)
+    SELECT p.meeting_id, p.id, 'görev', 'MEDIUM', 'PENDING',
+           current_date + (p.id % 30), now() - p.id * interval '1 second', now()
+    FROM participants p
+    """,
+    """
+    INSERT INTO progress_reports (meeting_id, report_type, content, generated_at)
+    SELECT m.id, 'MEETING', '{}'::jsonb, m.created_at FROM meetings m
+    """,
+]
+
+
+def _queries(meeting_id: int, participant_id: int, sha256: str):
+    cursor = (datetime.now(), 1_000_000)
+    return {
+        "meetings: list": select(Meeting)
+        .order_by(Meeting.created_at.desc(), Meeting.id.desc())
+        .limit(20),
+        "meetings: list by status after cursor": select(Meeting)
+        .where(Meeting.status == MeetingStatus.COMPLETED)
+        .where(tuple_(Meeting.created_at, Meeting.id) < cursor)
+        .order_by(Meeting.created_at.desc(), Meeting.id.desc())
+        .limit(20),
+        "meetings: duplicate by sha256": select(Meeting).where(Meeting.audio_sha256 == sha256),
+        "participants: by meeting": select(Participant).where(
+            Participant.meeting_id == meeting_id
+        ),
+        "transcript: ordered segments": select(TranscriptSegment)
+        .where(TranscriptSegment.meeting_id == meeting_id)
+        .order_by(TranscriptSegment.segment_order),
+        "tasks: by meeting": select(Task)
+        .where(Task.meeting_id == meeting_id)
+        .order_by(Task.created_at),
+        # Built like the endpoint builds them, assignee join included.
+        "tasks: list by status": task_list_query(status=TaskStatus.PENDING).limit(21),
+        "tasks: list by assignee": task_list_query(assignee_id=participant_id).limit(21),
+        "reports: latest": select(ProgressReport)
+        .order_by(ProgressReport.generated_at.desc())
+        .limit(20),
+        "reports: by meeting": select(ProgressReport).where(
+            ProgressReport.meeting_id == meeting_id
+        ),
+        "search: transcript segments": select(TranscriptSegment.id).where(
+            TranscriptSegment.search_vector.op("@@")(
+                literal_column("websearch_to_tsquery('turkish', 'bütçe onayı')")
+            )
+        ),
+    }
+
+
+# Rare (1 in 10,000 segments) and common (1 in 4) terms of the synthetic transcripts.
+_SEARCH_TERMS = ("bütçe onayı", "proje takvimi")
+
+
+def _node_types(plan: dict):
+    yield plan["Node Type"], plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from _node_types(child)
+
+
+async def _execution_ms(db, query) -> float:
+    """Server-side execution time of ``query`` from EXPLAIN ANALYZE."""
+    # Compiled for the driver, bind casts included: the search query binds a
+    # regconfig, which has no literal renderer. Its parameters are plain
+    # strings and ints that need no bind processing.
+    conn = await db.connection()
+    compiled = query.compile(dialect=conn.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    sql = f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}"
+    raw = (await conn.exec_driver_sql(sql, params)).scalar()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Execution Time"]
+
+
+async def main(meetings: int, segments: int, search_budget_ms: float) -> int:
+    failures = 0
+    async with async_session() as db:
+        for statement in _POPULATE:
+            await db.execute(text(statement), {"meetings": meetings, "segments": segments})
+        for table in ("meetings", "participants", "transcript_segments", "tasks", "progress_reports"):
+            await db.execute(text(f"ANALYZE {table}"))
+
+        meeting_id, sha256 = (
+            await db.execute(select(Meeting.id, Meeting.audio_sha256).limit(1))
+        ).one()
+        participant_id = (
+            await db.execute(select(Participant.id).where(Participant.meeting_id == meeting_id))
+        ).scalar()
+
+        for name, query in _queries(meeting_id, participant_id, sha256).items():
+            sql = query.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            raw = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            seq_scans = [rel for node, rel in _node_types(plan) if node == "Seq Scan"]
+            status = "SEQ SCAN on " + ", ".join(seq_scans) if seq_scans else "ok"
+            failures += bool(seq_scans)
+            print(f"{name:<42} {status}")
+
+        print(f"\nsearch latency over {meetings * segments:,} segments")
+        for term in _SEARCH_TERMS:
+            query = search_query(term, list(SearchKind), None, 20)
+            # Best of three, so the first run's cold buffers do not count.
+            ms = min([await _execution_ms(db, query) for _ in range(3)])
+            failures += ms > search_budget_ms
+            status = "ok" if ms <= search_budget_ms else f"over {search_budget_ms:.0f} ms"
+            print(f"{'search: ' + term:<42} {ms:7.1f} ms  {status}")
+
+        await db.rollback()
+    await engine.dispose()
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--segments", type=int, default=50, help="segments per meeting")
+    parser.add_argument("--search-budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    failures = asyncio.run(main(args.meetings, args.segments, args.search_budget_ms))
+    sys.exit(1 if failures else 0)
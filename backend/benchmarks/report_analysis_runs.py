@@ -0,0 +1,57 @@
+"""Compare LLM analysis modes per provider from recorded runs.
+
+Prints, per provider, model and mode (``MA_LLM_ANALYSIS_MODE``), the number
+of runs, median and p95 latency, and mean calls and tokens per meeting.
+
+Usage (from backend/):
+    python -m benchmarks.report_analysis_runs --days 30
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.database import async_session, engine
+from app.models.analysis_run import AnalysisRun
+
+
+async def main(days: int):
+    since = datetime.now() - timedelta(days=days)
+    query = (
+        select(
+            AnalysisRun.provider,
+            AnalysisRun.model,
+            AnalysisRun.mode,
+            func.count(),
+            func.percentile_cont(0.5).within_group(AnalysisRun.latency_seconds),
+            func.percentile_cont(0.95).within_group(AnalysisRun.latency_seconds),
+            func.avg(AnalysisRun.llm_calls),
+            func.avg(AnalysisRun.input_tokens),
+            func.avg(AnalysisRun.output_tokens),
+        )
+        .where(AnalysisRun.created_at >= since)
+        .group_by(AnalysisRun.provider, AnalysisRun.model, AnalysisRun.mode)
+        .order_by(AnalysisRun.provider, AnalysisRun.model, AnalysisRun.mode)
+    )
+    async with async_session() as db:
+        rows = (await db.execute(query)).all()
+    await engine.dispose()
+
+    print(
+        f"{'provider':<8} {'model':<28} {'mode':<9} {'runs':>5} {'p50 s':>7} {'p95 s':>7} "
+        f"{'calls':>6} {'in tok':>8} {'out tok':>8}"
+    )
+    for provider, model, mode, runs, p50, p95, calls, tokens_in, tokens_out in rows:
+        print(
+            f"{provider:<8} {model:<28} {mode:<9} {runs:>5} {p50:>7.1f} {p95:>7.1f} "
+            f"{calls:>6.1f} {tokens_in:>8.0f} {tokens_out:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.days))
@@ -0,0 +1,59 @@
+"""Report how much audio and compute the VAD pre-pass kept out of ASR and diarization.
+
+Reads ``audio_seconds``, ``silence_seconds`` and ``asr_seconds`` of processed
+meetings. Saved compute is the skipped silence times the real-time factor
+measured on the speech that was processed (ASR wall time per speech second).
+``--rtf`` overrides the measured factor, e.g. with one from bench_asr_tiers.
+
+Usage (from backend/):
+    python -m benchmarks.report_vad_savings
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.database import async_session, engine
+from app.models.meeting import Meeting
+
+
+async def main(rtf: float | None):
+    async with async_session() as db:
+        meetings, audio, silence = (
+            await db.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(Meeting.audio_seconds), 0.0),
+                    func.coalesce(func.sum(Meeting.silence_seconds), 0.0),
+                ).where(Meeting.audio_seconds.is_not(None))
+            )
+        ).one()
+        timed, timed_audio, timed_silence, asr = (
+            await db.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(Meeting.audio_seconds), 0.0),
+                    func.coalesce(func.sum(Meeting.silence_seconds), 0.0),
+                    func.coalesce(func.sum(Meeting.asr_seconds), 0.0),
+                ).where(Meeting.audio_seconds.is_not(None), Meeting.asr_seconds.is_not(None))
+            )
+        ).one()
+    await engine.dispose()
+
+    print(f"meetings        {meetings}")
+    print(f"audio           {audio / 3600:.1f} h")
+    print(f"silence skipped {silence / 3600:.1f} h ({100 * silence / audio if audio else 0:.1f}%)")
+    speech = timed_audio - timed_silence
+    if rtf is None and speech > 0:
+        rtf = asr / speech
+        print(f"ASR time        {asr / 3600:.1f} h over {timed} meetings (RTF {rtf:.3f})")
+    if rtf is not None:
+        print(f"compute saved   {silence * rtf / 3600:.1f} h at RTF {rtf:.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtf", type=float, default=None, help="default: measured")
+    args = parser.parse_args()
+    asyncio.run(main(args.rtf))
@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Queue
 
 from app.config import settings
 
@@ -6,7 +7,7 @@ celery = Celery(
     "meeting_assistant",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["app.workers.tasks"],
+    include=["app.workers.tasks", "app.workers.signals"],
 )
 
 celery.conf.update(
@@ -15,4 +16,25 @@ celery.conf.update(
     result_serializer="json",
     timezone="Europe/Istanbul",
     enable_utc=True,
+    # CPU-bound ASR and network-bound LLM work scale on separate worker pools:
+    #   celery -A celery_app worker -Q asr -P prefork --concurrency=<cores / MA_ASR_THREADS>
+    #   celery -A celery_app worker -Q llm -P threads --concurrency=64
+    task_queues=(Queue("asr"), Queue("llm")),
+    task_default_queue="llm",
+    task_routes={
+        "app.workers.tasks.transcribe_meeting": {"queue": "asr"},
+        "app.workers.tasks.refine_meeting_transcript": {"queue": "asr"},
+    },
+    # Long ASR jobs must not sit prefetched behind another job on a busy worker.
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    # Redis emulates message priorities with one list per step; 0 is served
+    # first. Pipeline stages use the default (0), refinement of draft
+    # transcripts runs at the lowest step so it never delays new uploads.
+    broker_transport_options={
+        "visibility_timeout": 6 * 3600,
+        "priority_steps": list(range(10)),
+        "sep": ":",
+        "queue_order_strategy": "priority",
+    },
 )
@@ -0,0 +1,52 @@
+"""Pipeline bookkeeping columns and indexes for the hot queries
+
+Adds the upload/ASR/checkpoint columns on meetings and indexes for foreign
+keys, ordered transcript reads and keyset pagination of meetings and tasks.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+_INDEXES = [
+    ("ix_meetings_audio_sha256", "meetings", ["audio_sha256"]),
+    ("ix_meetings_created_at_id", "meetings", ["created_at", "id"]),
+    ("ix_meetings_status_created_at_id", "meetings", ["status", "created_at", "id"]),
+    ("ix_meetings_date", "meetings", ["date"]),
+    ("ix_participants_meeting_id", "participants", ["meeting_id"]),
+    ("ix_progress_reports_meeting_id", "progress_reports", ["meeting_id"]),
+    ("ix_progress_reports_generated_at", "progress_reports", ["generated_at"]),
+    ("ix_tasks_created_at_id", "tasks", ["created_at", "id"]),
+    ("ix_tasks_status_created_at_id", "tasks", ["status", "created_at", "id"]),
+    ("ix_tasks_assignee_created_at_id", "tasks", ["assignee_id", "created_at", "id"]),
+    ("ix_tasks_priority_created_at_id", "tasks", ["priority", "created_at", "id"]),
+    ("ix_tasks_meeting_created_at_id", "tasks", ["meeting_id", "created_at", "id"]),
+    ("ix_tasks_due_date", "tasks", ["due_date"]),
+    ("ix_transcript_segments_meeting_order", "transcript_segments", ["meeting_id", "segment_order"]),
+    ("ix_transcript_segments_participant_id", "transcript_segments", ["participant_id"]),
+]
+
+
+def upgrade() -> None:
+    op.add_column("meetings", sa.Column("audio_sha256", sa.String(length=64), nullable=True))
+    op.add_column("meetings", sa.Column("audio_size_bytes", sa.BigInteger(), nullable=True))
+    op.add_column("meetings", sa.Column("asr_model", sa.String(length=50), nullable=True))
+    op.add_column("meetings", sa.Column("asr_language", sa.String(length=10), nullable=True))
+    op.add_column("meetings", sa.Column("processing_stage", sa.String(length=30), nullable=True))
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
+    for column in ("processing_stage", "asr_language", "asr_model", "audio_size_bytes", "audio_sha256"):
+        op.drop_column("meetings", column)
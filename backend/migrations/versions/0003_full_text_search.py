@@ -0,0 +1,41 @@
+"""Turkish full-text search vectors on segments, summaries and tasks
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# table, source column, index name
+_SEARCH_COLUMNS = [
+    ("transcript_segments", "text", "ix_transcript_segments_search"),
+    ("summaries", "full_summary", "ix_summaries_search"),
+    ("tasks", "title", "ix_tasks_search"),
+]
+
+
+def upgrade() -> None:
+    for table, source, index in _SEARCH_COLUMNS:
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(f"to_tsvector('turkish', {source})", persisted=True),
+            ),
+        )
+        op.create_index(index, table, ["search_vector"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    for table, _, index in reversed(_SEARCH_COLUMNS):
+        op.drop_index(index, table_name=table)
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,31 @@
+"""Per-meeting transcription tier policy and draft flag
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+asr_policy = sa.Enum("ACCURATE", "DRAFT", "TIERED", name="asrpolicy")
+
+
+def upgrade() -> None:
+    asr_policy.create(op.get_bind(), checkfirst=True)
+    op.add_column("meetings", sa.Column("asr_policy", asr_policy, nullable=True))
+    op.add_column(
+        "meetings",
+        sa.Column("transcript_draft", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("meetings", "transcript_draft")
+    op.drop_column("meetings", "asr_policy")
+    asr_policy.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,24 @@
+"""Per-meeting recording length and silence skipped by the VAD pre-pass
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("meetings", sa.Column("audio_seconds", sa.Float(), nullable=True))
+    op.add_column("meetings", sa.Column("silence_seconds", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("meetings", "silence_seconds")
+    op.drop_column("meetings", "audio_seconds")
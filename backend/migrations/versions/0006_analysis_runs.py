@@ -0,0 +1,38 @@
+"""Latency and token usage of LLM analysis runs
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis_runs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("meeting_id", sa.Integer(), nullable=False),
+        sa.Column("provider", sa.String(length=30), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("mode", sa.String(length=20), nullable=False),
+        sa.Column("latency_seconds", sa.Float(), nullable=False),
+        sa.Column("llm_calls", sa.Integer(), nullable=False),
+        sa.Column("input_tokens", sa.Integer(), nullable=False),
+        sa.Column("output_tokens", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["meeting_id"], ["meetings.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_analysis_runs_meeting_id", "analysis_runs", ["meeting_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analysis_runs_meeting_id", table_name="analysis_runs")
+    op.drop_table("analysis_runs")
@@ -0,0 +1,22 @@
+"""Per-meeting wall time of the ASR and diarization stages
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("meetings", sa.Column("asr_seconds", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("meetings", "asr_seconds")
@@ -1,14 +1,22 @@
 import axios from 'axios'
-import type { Meeting, Transcript, Summary, Task, ProgressReport } from '../types'
+import type { Meeting, Transcript, Summary, Task, TaskFilters, Page, ProgressReport, ProgressEvent } from '../types'
 
 const api = axios.create({ baseURL: '/api' })
 
+// List endpoints return one keyset page and the next page's cursor in a header.
+const PAGE_SIZE = 100
+
+const getPage = async <T>(url: string, params: object, cursor?: string | null): Promise<Page<T>> => {
+  const r = await api.get<T[]>(url, { params: { ...params, limit: PAGE_SIZE, cursor: cursor ?? undefined } })
+  const next = r.headers['x-next-cursor']
+  return { items: r.data, nextCursor: typeof next === 'string' && next ? next : null }
+}
+
 // Meetings
 export const createMeeting = (data: { title: string; description?: string }) =>
   api.post<Meeting>('/meetings', data).then((r) => r.data)
 
-export const getMeetings = () =>
-  api.get<Meeting[]>('/meetings').then((r) => r.data)
+export const getMeetings = (cursor?: string | null) => getPage<Meeting>('/meetings', {}, cursor)
 
 export const getMeeting = (id: number) =>
   api.get<Meeting>(`/meetings/${id}`).then((r) => r.data)
@@ -25,6 +33,17 @@ export const uploadAudio = (meetingId: number, file: File) => {
 export const getMeetingStatus = (id: number) =>
   api.get<{ status: string }>(`/meetings/${id}/status`).then((r) => r.data)
 
+const PROGRESS_EVENTS = ['stage_started', 'stage_completed', 'transcribe_progress', 'segments_persisted', 'completed', 'failed', 'status']
+
+// Server-Sent Events; the server closes the stream once processing ends.
+export const subscribeMeetingEvents = (id: number, onEvent: (e: ProgressEvent) => void) => {
+  const source = new EventSource(`/api/meetings/${id}/events`)
+  PROGRESS_EVENTS.forEach((name) =>
+    source.addEventListener(name, (e) => onEvent(JSON.parse((e as MessageEvent).data))),
+  )
+  return source
+}
+
 // Participants
 export const getParticipants = (meetingId: number) =>
   api.get(`/meetings/${meetingId}/participants`).then((r) => r.data)
@@ -47,8 +66,8 @@ export const regenerateSummary = (meetingId: number) =>
 export const getMeetingTasks = (meetingId: number) =>
   api.get<Task[]>(`/meetings/${meetingId}/tasks`).then((r) => r.data)
 
-export const getAllTasks = (status?: string) =>
-  api.get<Task[]>('/tasks', { params: status ? { status } : {} }).then((r) => r.data)
+export const getTasks = (filters: TaskFilters = {}, cursor?: string | null) =>
+  getPage<Task>('/tasks', filters, cursor)
 
 export const updateTask = (taskId: number, data: Partial<Task>) =>
   api.put<Task>(`/tasks/${taskId}`, data).then((r) => r.data)
@@ -1,11 +1,24 @@
 import { useEffect, useState } from 'react'
 import { useParams, Link } from 'react-router-dom'
 import { FiArrowLeft, FiUpload, FiRefreshCw } from 'react-icons/fi'
-import type { Meeting, Transcript, Summary, Task } from '../../types'
-import { getMeeting, uploadAudio, getMeetingStatus, getTranscript, getSummary, getMeetingTasks, regenerateSummary } from '../../api/client'
+import type { Meeting, Transcript, Summary, Task, ProgressEvent } from '../../types'
+import { getMeeting, uploadAudio, subscribeMeetingEvents, getTranscript, getSummary, getMeetingTasks, regenerateSummary } from '../../api/client'
 import TranscriptViewer from '../TranscriptViewer/TranscriptViewer'
 import TaskList from '../TaskBoard/TaskList'
 
+const STAGE_LABELS: Record<string, string> = {
+  decode: 'Ses çözülüyor',
+  vad: 'Sessiz bölümler ayıklanıyor',
+  transcribe: 'Konuşma metne dönüştürülüyor',
+  align: 'Zaman damgaları hizalanıyor',
+  diarize: 'Konuşmacılar ayrıştırılıyor',
+  assign: 'Konuşmacılar eşleştiriliyor',
+  persist: 'Transkript kaydediliyor',
+  analyze: 'Özet ve görevler çıkarılıyor',
+  summarize: 'Özet oluşturuluyor',
+  extract_tasks: 'Görevler çıkarılıyor',
+}
+
 export default function MeetingDetail() {
   const { id } = useParams<{ id: string }>()
   const meetingId = Number(id)
@@ -15,6 +28,7 @@ export default function MeetingDetail() {
   const [summary, setSummary] = useState<Summary | null>(null)
   const [tasks, setTasks] = useState<Task[]>([])
   const [activeTab, setActiveTab] = useState<'transcript' | 'summary' | 'tasks'>('transcript')
+  const [progress, setProgress] = useState<ProgressEvent | null>(null)
 
   const load = async () => {
     const m = await getMeeting(meetingId)
@@ -34,17 +48,19 @@ export default function MeetingDetail() {
 
   useEffect(() => { load() }, [meetingId])
 
-  // Poll for status while processing
+  // Follow processing progress pushed by the server
   useEffect(() => {
     if (!meeting || meeting.status !== 'processing') return
-    const interval = setInterval(async () => {
-      const { status } = await getMeetingStatus(meetingId)
-      if (status !== 'processing') {
-        clearInterval(interval)
+    const source = subscribeMeetingEvents(meetingId, (e) => {
+      if (e.event === 'completed' || e.event === 'failed' || e.event === 'status') {
+        source.close()
+        setProgress(null)
         load()
+      } else {
+        setProgress(e)
       }
-    }, 5000)
-    return () => clearInterval(interval)
+    })
+    return () => source.close()
   }, [meeting?.status])
 
   const handleUpload = async (e: React.ChangeEvent<HTMLInputElement>) => {
@@ -79,6 +95,11 @@ export default function MeetingDetail() {
               <span className={`font-medium ${meeting.status === 'completed' ? 'text-green-500' : meeting.status === 'processing' ? 'text-blue-500' : meeting.status === 'failed' ? 'text-red-500' : 'text-yellow-500'}`}>
                 {meeting.status === 'completed' ? 'Tamamlandı' : meeting.status === 'processing' ? 'İşleniyor...' : meeting.status === 'failed' ? 'Hata' : 'Yükleniyor'}
               </span>
+              {meeting.transcript_draft && (
+                <span className="px-2 py-0.5 rounded bg-amber-50 text-amber-600 text-xs" title={meeting.asr_policy === 'tiered' ? 'Hızlı taslak döküm; ayrıntılı döküm hazırlanınca güncellenir' : 'Hızlı taslak döküm'}>
+                  Taslak döküm
+                </span>
+              )}
             </div>
           </div>
           {meeting.status === 'uploading' && (
@@ -94,7 +115,15 @@ export default function MeetingDetail() {
         <div className="bg-blue-50 border border-blue-200 rounded-lg p-6 text-center">
           <FiRefreshCw className="animate-spin mx-auto mb-2 text-blue-500" size={24} />
           <p className="text-blue-700 font-medium">Ses dosyası işleniyor...</p>
-          <p className="text-sm text-blue-500 mt-1">Transkripsiyon ve analiz devam ediyor. Bu işlem birkaç dakika sürebilir.</p>
+          {progress?.stage ? (
+            <p className="text-sm text-blue-500 mt-1">
+              {STAGE_LABELS[progress.stage] ?? progress.stage}
+              {progress.percent !== undefined && ` — %${Math.round(progress.percent)}`}
+              {progress.eta_seconds ? ` (yaklaşık ${Math.ceil(progress.eta_seconds / 60)} dk kaldı)` : ''}
+            </p>
+          ) : (
+            <p className="text-sm text-blue-500 mt-1">Transkripsiyon ve analiz devam ediyor. Bu işlem birkaç dakika sürebilir.</p>
+          )}
         </div>
       )}
 
@@ -15,17 +15,32 @@ const statusConfig = {
 export default function MeetingList() {
   const [meetings, setMeetings] = useState<Meeting[]>([])
   const [showModal, setShowModal] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   const load = async () => {
     setLoading(true)
     try {
-      setMeetings(await getMeetings())
+      const page = await getMeetings()
+      setMeetings(page.items)
+      setNextCursor(page.nextCursor)
     } finally {
       setLoading(false)
     }
   }
 
+  const loadMore = async () => {
+    setLoadingMore(true)
+    try {
+      const page = await getMeetings(nextCursor)
+      setMeetings((loaded) => [...loaded, ...page.items])
+      setNextCursor(page.nextCursor)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   useEffect(() => { load() }, [])
 
   const handleDelete = async (id: number) => {
@@ -90,6 +105,15 @@ export default function MeetingList() {
               </Link>
             )
           })}
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="text-sm text-indigo-600 hover:text-indigo-800 disabled:text-gray-400"
+            >
+              {loadingMore ? 'Yükleniyor...' : 'Daha fazla göster'}
+            </button>
+          )}
         </div>
       )}
 
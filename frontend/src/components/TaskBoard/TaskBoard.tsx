@@ -1,32 +1,106 @@
 import { useEffect, useState } from 'react'
-import type { Task } from '../../types'
-import { getAllTasks } from '../../api/client'
+import type { Task, TaskFilters, TaskPriority, TaskStatus } from '../../types'
+import { getTasks } from '../../api/client'
 import TaskList from './TaskList'
 
+const selectClass = 'text-sm border border-gray-200 rounded px-2 py-1'
+
 export default function TaskBoard() {
   const [tasks, setTasks] = useState<Task[]>([])
+  const [filters, setFilters] = useState<TaskFilters>({})
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  // Assignees seen so far, for the filter; there is no global participant list.
+  const [assignees, setAssignees] = useState<Record<number, string>>({})
+
+  const remember = (items: Task[]) =>
+    setAssignees((known) => {
+      const next = { ...known }
+      items.forEach((t) => { if (t.assignee_id && t.assignee_name) next[t.assignee_id] = t.assignee_name })
+      return next
+    })
 
   const load = async () => {
     setLoading(true)
     try {
-      setTasks(await getAllTasks())
+      const page = await getTasks(filters)
+      setTasks(page.items)
+      setNextCursor(page.nextCursor)
+      remember(page.items)
     } finally {
       setLoading(false)
     }
   }
 
-  useEffect(() => { load() }, [])
+  const loadMore = async () => {
+    setLoadingMore(true)
+    try {
+      const page = await getTasks(filters, nextCursor)
+      setTasks((loaded) => [...loaded, ...page.items])
+      setNextCursor(page.nextCursor)
+      remember(page.items)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  const handleUpdate = (updated: Task) =>
+    setTasks((loaded) => loaded.map((t) => (t.id === updated.id ? updated : t)))
 
-  if (loading) return <div className="text-center py-12 text-gray-500">Yükleniyor...</div>
+  const setFilter = (change: TaskFilters) => setFilters((current) => ({ ...current, ...change }))
+
+  useEffect(() => { load() }, [filters])
 
   return (
     <div>
       <h1 className="text-2xl font-bold text-gray-900 mb-6">Tüm Görevler</h1>
-      {tasks.length === 0 ? (
+      <div className="flex flex-wrap items-center gap-3 mb-4 text-sm text-gray-600">
+        <select className={selectClass} value={filters.status ?? ''} onChange={(e) => setFilter({ status: (e.target.value || undefined) as TaskStatus | undefined })}>
+          <option value="">Tüm durumlar</option>
+          <option value="pending">Bekleyen</option>
+          <option value="in_progress">Devam Eden</option>
+          <option value="completed">Tamamlanan</option>
+        </select>
+        <select className={selectClass} value={filters.priority ?? ''} onChange={(e) => setFilter({ priority: (e.target.value || undefined) as TaskPriority | undefined })}>
+          <option value="">Tüm öncelikler</option>
+          <option value="high">Yüksek</option>
+          <option value="medium">Orta</option>
+          <option value="low">Düşük</option>
+        </select>
+        <select className={selectClass} value={filters.assignee_id ?? ''} onChange={(e) => setFilter({ assignee_id: e.target.value ? Number(e.target.value) : undefined })}>
+          <option value="">Tüm sorumlular</option>
+          {Object.entries(assignees).map(([id, name]) => (
+            <option key={id} value={id}>{name}</option>
+          ))}
+        </select>
+        <label className="flex items-center gap-1">
+          Bitiş
+          <input type="date" className={selectClass} value={filters.due_from ?? ''} onChange={(e) => setFilter({ due_from: e.target.value || undefined })} />
+          –
+          <input type="date" className={selectClass} value={filters.due_to ?? ''} onChange={(e) => setFilter({ due_to: e.target.value || undefined })} />
+        </label>
+      </div>
+
+      {loading ? (
+        <div className="text-center py-12 text-gray-500">Yükleniyor...</div>
+      ) : tasks.length === 0 ? (
         <p className="text-gray-500 text-center py-12">Henüz görev yok. Toplantı işlendikten sonra görevler otomatik oluşturulacak.</p>
       ) : (
-        <TaskList tasks={tasks} onUpdate={load} />
+        <>
+          <TaskList tasks={tasks} onUpdate={handleUpdate} />
+          {nextCursor && (
+            <div className="text-center mt-4">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="text-sm text-indigo-600 hover:text-indigo-800 disabled:text-gray-400"
+              >
+                {loadingMore ? 'Yükleniyor...' : 'Daha fazla göster'}
+              </button>
+            </div>
+          )}
+        </>
       )}
     </div>
   )
@@ -4,7 +4,7 @@ import { updateTask } from '../../api/client'
 
 interface Props {
   tasks: Task[]
-  onUpdate: () => void
+  onUpdate: (task: Task) => void
 }
 
 const statusLabels: Record<TaskStatus, string> = {
@@ -21,8 +21,7 @@ const priorityConfig = {
 
 export default function TaskList({ tasks, onUpdate }: Props) {
   const handleStatusChange = async (taskId: number, status: TaskStatus) => {
-    await updateTask(taskId, { status })
-    onUpdate()
+    onUpdate(await updateTask(taskId, { status }))
   }
 
   const columns: TaskStatus[] = ['pending', 'in_progress', 'completed']
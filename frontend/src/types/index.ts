@@ -1,6 +1,7 @@
 export type MeetingStatus = 'uploading' | 'processing' | 'completed' | 'failed'
 export type TaskPriority = 'low' | 'medium' | 'high'
 export type TaskStatus = 'pending' | 'in_progress' | 'completed'
+export type AsrPolicy = 'accurate' | 'draft' | 'tiered'
 
 export interface Meeting {
   id: number
@@ -9,6 +10,11 @@ export interface Meeting {
   date: string
   duration_seconds: number | null
   status: MeetingStatus
+  asr_policy: AsrPolicy | null
+  transcript_draft: boolean
+  audio_seconds: number | null
+  silence_seconds: number | null
+  asr_seconds: number | null
   created_at: string
   updated_at: string
   participants?: Participant[]
@@ -35,7 +41,7 @@ export interface TranscriptSegment {
 export interface Transcript {
   meeting_id: number
   segments: TranscriptSegment[]
-  full_text: string
+  full_text?: string | null
 }
 
 export interface Summary {
@@ -61,6 +67,20 @@ export interface Task {
   updated_at: string
 }
 
+export interface TaskFilters {
+  status?: TaskStatus
+  assignee_id?: number
+  priority?: TaskPriority
+  due_from?: string
+  due_to?: string
+}
+
+// One keyset page of a list endpoint; pass nextCursor back to get the next one.
+export interface Page<T> {
+  items: T[]
+  nextCursor: string | null
+}
+
 export interface ProgressReport {
   id: number
   meeting_id: number | null
@@ -68,3 +88,13 @@ export interface ProgressReport {
   content: Record<string, unknown>
   generated_at: string
 }
+
+export interface ProgressEvent {
+  meeting_id: number
+  event: 'stage_started' | 'stage_completed' | 'transcribe_progress' | 'segments_persisted' | 'completed' | 'failed' | 'status'
+  stage?: string
+  percent?: number
+  eta_seconds?: number | null
+  segments?: number
+  status?: MeetingStatus
+}